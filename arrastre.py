@@ -0,0 +1,251 @@
+import numpy as np
+import calculos
+
+# Estados en lote: arreglos (N, 4) con columnas (x, y, vx, vy).
+# El arrastre cuadrático es a = -g ŷ - k |v| v, con k = rho * Cd * A / (2 m) en 1/m.
+
+def aceleracion_arrastre(vel, k, g):
+    """Aceleración de gravedad más arrastre cuadrático para velocidades (..., 2)."""
+    vel = np.asarray(vel, dtype=float)
+    k = np.asarray(k, dtype=float)
+    rapidez = np.sqrt(np.sum(vel * vel, axis=-1, keepdims=True))
+    acel = -k[..., None] * rapidez * vel if k.ndim else -k * rapidez * vel
+    acel[..., 1] -= g
+    return acel
+
+def _derivada(estado, k, g):
+    """d(x, y, vx, vy)/dt para un lote de estados (N, 4)."""
+    derivada = np.empty_like(estado)
+    derivada[:, :2] = estado[:, 2:]
+    derivada[:, 2:] = aceleracion_arrastre(estado[:, 2:], k, g)
+    return derivada
+
+def paso_rk4(estado, h, k, g):
+    """Un paso de Runge-Kutta clásico de orden 4; h puede ser escalar o (N,)."""
+    h = np.asarray(h, dtype=float)
+    h = h[:, None] if h.ndim else h
+    k1 = _derivada(estado, k, g)
+    k2 = _derivada(estado + 0.5 * h * k1, k, g)
+    k3 = _derivada(estado + 0.5 * h * k2, k, g)
+    k4 = _derivada(estado + h * k3, k, g)
+    return estado + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+def integrar_rk4(estado0, t_final, k, g, n_pasos=200):
+    """
+    Integra cada fila hasta su propio t_final con n_pasos pasos de RK4 de tamaño
+    t_final / n_pasos, todas las filas a la vez. Retorna los estados finales (N, 4).
+    """
+    estado = np.array(estado0, dtype=float)
+    h = np.broadcast_to(np.asarray(t_final, dtype=float), estado.shape[:1]) / n_pasos
+    for _ in range(n_pasos):
+        estado = paso_rk4(estado, h, k, g)
+    return estado
+
+# Tabla de Butcher de Dormand-Prince 5(4)
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_DP_B5 = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+_DP_B4 = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+def integrar_adaptativo(estado0, t_final, k, g, rtol=1e-8, atol=1e-8, h_inicial=0.01, max_iter=10_000):
+    """
+    Integra cada fila hasta su propio t_final con Dormand-Prince 5(4) y paso adaptativo
+    por fila: todas las filas avanzan juntas, cada una con su paso y su error.
+    Retorna (estados finales (N, 4), número de iteraciones).
+    """
+    estado = np.array(estado0, dtype=float)
+    n = len(estado)
+    t_final = np.broadcast_to(np.asarray(t_final, dtype=float), (n,))
+    k = np.broadcast_to(np.asarray(k, dtype=float), (n,))
+    t = np.zeros(n)
+    h = np.minimum(h_inicial, t_final)
+    activo = t_final > 0
+
+    for iteracion in range(1, max_iter + 1):
+        if not activo.any():
+            break
+        filas = np.flatnonzero(activo)
+        y, hh, kk = estado[filas], h[filas][:, None], k[filas]
+        etapas = []
+        for coeficientes in _DP_A:
+            incremento = sum(a * e for a, e in zip(coeficientes, etapas)) if coeficientes else 0.0
+            etapas.append(_derivada(y + hh * incremento, kk, g))
+        etapas = np.array(etapas)
+        y5 = y + hh * np.tensordot(_DP_B5, etapas, axes=1)
+        y4 = y + hh * np.tensordot(_DP_B4, etapas, axes=1)
+        escala = atol + rtol * np.maximum(np.abs(y), np.abs(y5))
+        error = np.sqrt(np.mean(((y5 - y4) / escala)**2, axis=1))
+
+        aceptado = error <= 1.0
+        estado[filas[aceptado]] = y5[aceptado]
+        t[filas[aceptado]] += h[filas[aceptado]]
+        with np.errstate(divide='ignore'):
+            factor = np.clip(0.9 * error**-0.2, 0.2, 5.0)
+        restante = t_final[filas] - t[filas]
+        h[filas] = np.minimum(h[filas] * factor, restante)
+        activo[filas] = restante > 1e-12 * np.maximum(t_final[filas], 1.0)
+    return estado, iteracion
+
+def integrar(estado0, t_final, k, g, integrador="rk4", n_pasos=200):
+    """Integra con 'rk4' (paso fijo por fila) o 'rk45' (adaptativo). Retorna estados (N, 4)."""
+    if integrador == "rk45":
+        return integrar_adaptativo(estado0, t_final, k, g)[0]
+    return integrar_rk4(estado0, t_final, k, g, n_pasos)
+
+def impacto_suelo(estado0, k, g, dt=0.01, t_limite=1000.0, refinamientos=8):
+    """
+    Detecta el primer cruce de y = 0 hacia abajo de cada trayectoria (evento de impacto).
+    Avanza todas las filas con RK4 de paso dt y, en el paso del cruce, refina el instante
+    con regula falsi sobre pasos RK4 parciales. Retorna (t_impacto, estado_impacto);
+    NaN en las filas que no tocan el suelo antes de t_limite.
+    """
+    estado = np.array(estado0, dtype=float)
+    n = len(estado)
+    k = np.broadcast_to(np.asarray(k, dtype=float), (n,))
+    t_impacto = np.full(n, np.nan)
+    estado_impacto = np.full((n, 4), np.nan)
+    activo = np.ones(n, dtype=bool)
+    t = 0.0
+
+    while activo.any() and t < t_limite:
+        filas = np.flatnonzero(activo)
+        anterior = estado[filas]
+        nuevo = paso_rk4(anterior, dt, k[filas], g)
+        cruce = (nuevo[:, 1] < 0) & (anterior[:, 1] >= 0)
+        if cruce.any():
+            # Regula falsi (variante de Illinois) sobre la fracción s del paso
+            base, kc = anterior[cruce], k[filas[cruce]]
+            s_lo, s_hi = np.zeros(len(base)), np.ones(len(base))
+            y_lo, y_hi = base[:, 1], nuevo[cruce, 1]
+            for _ in range(refinamientos):
+                s = s_lo - y_lo * (s_hi - s_lo) / (y_hi - y_lo)
+                y_s = paso_rk4(base, s * dt, kc, g)[:, 1]
+                arriba = y_s >= 0
+                s_lo, y_lo = np.where(arriba, s, s_lo), np.where(arriba, y_s, y_lo / 2)
+                s_hi, y_hi = np.where(arriba, s_hi, s), np.where(arriba, y_hi / 2, y_s)
+            s = s_lo - y_lo * (s_hi - s_lo) / (y_hi - y_lo)
+            indices = filas[cruce]
+            t_impacto[indices] = t + s * dt
+            estado_impacto[indices] = paso_rk4(base, s * dt, kc, g)
+            activo[indices] = False
+        estado[filas] = nuevo
+        t += dt
+    return t_impacto, estado_impacto
+
+def _disparo(objetivo, vuelo, velocidad, k_B, g, integrador, n_pasos, tol=1e-6, max_iter=30):
+    """
+    Método de disparo en lote: busca la velocidad inicial de B (desde el origen) que lo
+    lleva a la posición objetivo (N, 2) tras un tiempo de vuelo (N,). Newton con jacobiano
+    por diferencias finitas; las tres trayectorias de cada fila se integran juntas.
+    Retorna (velocidades (N, 2), convergido (N,)).
+    """
+    velocidad = np.array(velocidad, dtype=float)
+    n = len(velocidad)
+    convergido = np.zeros(n, dtype=bool)
+    activo = np.isfinite(velocidad).all(axis=1) & (vuelo > 0)
+
+    for _ in range(max_iter):
+        filas = np.flatnonzero(activo)
+        if len(filas) == 0:
+            break
+        m = len(filas)
+        v0 = velocidad[filas]
+        paso = 1e-6 * np.maximum(np.sqrt(np.sum(v0 * v0, axis=1)), 1.0)
+        # Base y dos perturbaciones de cada fila en un solo lote
+        inicios = np.zeros((3 * m, 4))
+        inicios[:, 2:] = np.concatenate([v0, v0 + np.c_[paso, 0 * paso], v0 + np.c_[0 * paso, paso]])
+        finales = integrar(inicios, np.tile(vuelo[filas], 3), np.tile(k_B, 3) if np.ndim(k_B) else k_B,
+                           g, integrador, n_pasos)[:, :2]
+        base = finales[:m]
+        residuo = base - objetivo[filas]
+        jacobiano = np.stack([(finales[m:2*m] - base) / paso[:, None],
+                              (finales[2*m:] - base) / paso[:, None]], axis=2)
+
+        listo = np.sqrt(np.sum(residuo * residuo, axis=1)) < tol
+        convergido[filas[listo]] = True
+        activo[filas[listo]] = False
+
+        sigue = ~listo
+        with np.errstate(invalid='ignore'):
+            det = jacobiano[:, 0, 0] * jacobiano[:, 1, 1] - jacobiano[:, 0, 1] * jacobiano[:, 1, 0]
+            dvx = (jacobiano[:, 1, 1] * residuo[:, 0] - jacobiano[:, 0, 1] * residuo[:, 1]) / det
+            dvy = (jacobiano[:, 0, 0] * residuo[:, 1] - jacobiano[:, 1, 0] * residuo[:, 0]) / det
+        correccion = np.c_[dvx, dvy]
+        falla = sigue & ~np.isfinite(correccion).all(axis=1)
+        activo[filas[falla]] = False
+        avanza = sigue & ~falla
+        velocidad[filas[avanza]] = v0[avanza] - correccion[avanza]
+    return velocidad, convergido
+
+def resolver_intercepcion_arrastre(D, h, v, phi, T, g=9.81, k_A=0.0, k_B=None, integrador="rk4",
+                                   n_pasos=200, n_candidatos=24, tol=1e-6, max_rondas=12):
+    """
+    Intercepción de mínima velocidad con arrastre cuadrático (k_A para A, k_B para B;
+    k_B = k_A por defecto). Para cada tc candidato se resuelve por disparo la velocidad
+    inicial de B que alcanza la posición de A; todos los candidatos van en un mismo lote.
+    La malla de tc se refina alrededor del mejor hasta que su paso baja de tol.
+    Con k_A = k_B = 0 coincide con resolver_intercepcion.
+    Retorna un diccionario como el de resolver_intercepcion; lanza ValueError si no hay solución.
+    """
+    k_B = k_A if k_B is None else k_B
+    estado_A = np.array([[D, h, -v * np.cos(phi), v * np.sin(phi)]])
+
+    t_suelo, _ = impacto_suelo(estado_A, k_A, g)
+    if not np.isfinite(t_suelo[0]):
+        raise ValueError("A no toca el suelo: no se pudo calcular t_max válido.")
+    a, b = T + 0.1, 0.95 * t_suelo[0]
+    if b <= a:
+        raise ValueError(f"Intervalo inválido: T={T:.2f} es muy cercano a t_max={t_suelo[0]:.2f}")
+
+    lo, hi = a, b
+    tc_previos, velocidades_previas = None, None
+    for ronda in range(1, max_rondas + 1):
+        tc = np.linspace(lo, hi, n_candidatos)
+        pos_A = integrar(np.repeat(estado_A, n_candidatos, axis=0), tc, k_A, g, integrador, n_pasos)[:, :2]
+        vuelo = tc - T
+
+        # Arranque: interpolar la ronda anterior, o la solución sin arrastre hacia la posición de A
+        if velocidades_previas is None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                inicial = np.c_[pos_A[:, 0] / vuelo, (pos_A[:, 1] + 0.5 * g * vuelo**2) / vuelo]
+        else:
+            inicial = np.c_[np.interp(tc, tc_previos, velocidades_previas[:, 0]),
+                            np.interp(tc, tc_previos, velocidades_previas[:, 1])]
+        velocidades, convergido = _disparo(pos_A, vuelo, inicial, k_B, g, integrador, n_pasos)
+
+        u = np.sqrt(np.sum(velocidades**2, axis=1))
+        valido = convergido & (pos_A[:, 0] >= 0) & (pos_A[:, 1] >= 0) & (vuelo > 0.001)
+        u = np.where(valido, u, np.inf)
+        if not np.isfinite(u).any():
+            raise ValueError("No se encontró tc válido.")
+
+        mejor = int(np.argmin(u))
+        tc_optimo, velocidad_optima = tc[mejor], velocidades[mejor]
+        paso = tc[1] - tc[0]
+        if paso < tol:
+            break
+        tc_previos, velocidades_previas = tc, np.where(valido[:, None], velocidades, np.nan)
+        # Rellenar los candidatos inválidos para interpolar sólo entre valores convergidos
+        if not valido.all():
+            for columna in range(2):
+                velocidades_previas[:, columna] = np.interp(tc, tc[valido], velocidades[valido, columna])
+        lo, hi = max(a, tc_optimo - paso), min(b, tc_optimo + paso)
+
+    u_optimo = float(np.hypot(*velocidad_optima))
+    if u_optimo > calculos.LIMITE_VELOCIDAD_U:
+        raise ValueError(f"Velocidad u excesiva ({u_optimo:.1f} m/s).")
+    x_col, y_col = integrar(estado_A, tc_optimo, k_A, g, integrador, n_pasos)[0, :2]
+    return {
+        'D': D, 'h': h, 'v': v, 'phi': phi, 'T': T, 'g': g,
+        'u': u_optimo, 'theta': float(np.arctan2(velocidad_optima[1], velocidad_optima[0])),
+        'tc': float(tc_optimo), 'x_col': float(x_col), 'y_col': float(y_col),
+        'metodo': "Disparo con arrastre", 'iteraciones': ronda,
+        'k_A': k_A, 'k_B': k_B,
+    }
@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import numpy as np
+import calculos
+
+ARCHIVO_PROGRESO = "progreso.json"
+SALIDAS = ("u_opt", "tc_opt", "theta_opt", "factible")
+PARAMETROS = ("D", "h", "v", "phi", "T", "g")
+
+def _abrir_salidas(directorio, forma, reanudar):
+    """Abre (o crea) los .npy de salida como np.memmap con la forma de la malla."""
+    salidas = {}
+    for nombre in SALIDAS:
+        ruta = os.path.join(directorio, nombre + ".npy")
+        if reanudar:
+            salidas[nombre] = np.load(ruta, mmap_mode="r+")
+        else:
+            dtype = np.bool_ if nombre == "factible" else np.float64
+            salidas[nombre] = np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=forma)
+    return salidas
+
+def _leer_progreso(directorio):
+    """Retorna el progreso guardado o None si no existe o está dañado."""
+    try:
+        with open(os.path.join(directorio, ARCHIVO_PROGRESO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _guardar_progreso(directorio, progreso):
+    """Escribe el progreso de forma atómica para poder reanudar tras una interrupción."""
+    ruta = os.path.join(directorio, ARCHIVO_PROGRESO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(progreso, f, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+
+def ejecutar_barrido(directorio, ejes, fijos, tamano_bloque=100_000, metodo="analitico", progreso=None):
+    """
+    Barre una malla de escenarios por bloques y escribe u_opt, tc_opt, theta_opt y la máscara
+    de factibilidad (u <= LIMITE_VELOCIDAD_U) en archivos .npy mapeados en memoria.
+
+    ejes: diccionario ordenado parámetro -> valores 1-D (p. ej. {'phi': ..., 'T': ..., 'D': ...}),
+          que definen los ejes de la malla en ese orden. phi va en radianes.
+    fijos: valores escalares del resto de parámetros (D, h, v, phi, T, g).
+    Si el directorio ya contiene un barrido con la misma configuración, continúa donde quedó.
+    La memoria usada depende sólo de tamano_bloque, no del tamaño de la malla.
+    """
+    ejes = {k: np.asarray(v, dtype=float).ravel() for k, v in ejes.items()}
+    fijos = {k: float(v) for k, v in fijos.items()}
+    faltantes = [p for p in PARAMETROS if p not in ejes and p not in fijos and p != "g"]
+    if faltantes:
+        raise ValueError(f"Faltan parámetros del barrido: {', '.join(faltantes)}")
+    if not ejes:
+        raise ValueError("El barrido necesita al menos un eje; para un solo escenario use calculos.resolver_intercepcion.")
+    fijos.setdefault("g", 9.81)
+
+    forma = tuple(len(v) for v in ejes.values())
+    total = int(np.prod(forma))
+    n_bloques = (total + tamano_bloque - 1) // tamano_bloque
+    configuracion = {
+        "ejes": {k: v.tolist() for k, v in ejes.items()},
+        "fijos": fijos,
+        "tamano_bloque": tamano_bloque,
+        "metodo": metodo,
+    }
+
+    os.makedirs(directorio, exist_ok=True)
+    anterior = _leer_progreso(directorio)
+    reanudar = anterior is not None and anterior.get("configuracion") == configuracion
+    bloques_hechos = anterior["bloques_hechos"] if reanudar else 0
+    salidas = _abrir_salidas(directorio, forma, reanudar)
+    if not reanudar:
+        _guardar_progreso(directorio, {"configuracion": configuracion, "bloques_hechos": 0,
+                                       "bloques_total": n_bloques})
+
+    planos = {nombre: arr.reshape(-1) for nombre, arr in salidas.items()}
+    for bloque in range(bloques_hechos, n_bloques):
+        inicio = bloque * tamano_bloque
+        fin = min(inicio + tamano_bloque, total)
+        indices = np.unravel_index(np.arange(inicio, fin), forma)
+        valores = dict(fijos)
+        for (nombre, eje), idx in zip(ejes.items(), indices):
+            valores[nombre] = eje[idx]
+
+        tc, u, theta = calculos.resolver_lote(*(valores[p] for p in PARAMETROS), metodo=metodo)
+        planos["tc_opt"][inicio:fin] = tc
+        planos["u_opt"][inicio:fin] = u
+        planos["theta_opt"][inicio:fin] = theta
+        planos["factible"][inicio:fin] = np.isfinite(u) & (u <= calculos.LIMITE_VELOCIDAD_U)
+
+        # Primero los datos, después el progreso: un bloque sólo cuenta si ya está en disco
+        for arr in salidas.values():
+            arr.flush()
+        _guardar_progreso(directorio, {"configuracion": configuracion, "bloques_hechos": bloque + 1,
+                                       "bloques_total": n_bloques})
+        if progreso is not None:
+            progreso(bloque + 1, n_bloques)
+
+    return {nombre: os.path.join(directorio, nombre + ".npy") for nombre in SALIDAS}
+
+def _eje(texto):
+    """Convierte 'inicio fin n' en un eje lineal."""
+    inicio, fin, n = texto
+    return np.linspace(float(inicio), float(fin), int(n))
+
+def main():
+    """Punto de entrada: python barridos.py salida --phi 10 80 71 --T 0 3 31 --D 50 200 151 --h 20 --v 25"""
+    parser = argparse.ArgumentParser(description="Barrido de factibilidad y velocidad mínima por bloques")
+    parser.add_argument("directorio", help="Directorio de salida (.npy y progreso.json)")
+    for nombre, ayuda in (("D", "m"), ("h", "m"), ("v", "m/s"), ("phi", "grados"), ("T", "s")):
+        parser.add_argument(f"--{nombre}", nargs="+", required=True,
+                            help=f"Valor fijo o eje 'inicio fin n' ({ayuda})")
+    parser.add_argument("--g", type=float, default=9.81, help="Gravedad (m/s²)")
+    parser.add_argument("--bloque", type=int, default=100_000, help="Escenarios por bloque")
+    parser.add_argument("--metodo", choices=["analitico", "golden"], default="analitico",
+                        help="Método vectorizado de calculos.resolver_lote")
+    args = parser.parse_args()
+
+    ejes, fijos = {}, {"g": args.g}
+    for nombre in ("phi", "T", "D", "h", "v"):
+        valores = getattr(args, nombre)
+        if len(valores) == 3:
+            ejes[nombre] = _eje(valores)
+        elif len(valores) == 1:
+            fijos[nombre] = float(valores[0])
+        else:
+            parser.error(f"--{nombre} espera un valor o 'inicio fin n'")
+    if not ejes:
+        parser.error("indique al menos un eje 'inicio fin n'")
+    if "phi" in ejes:
+        ejes["phi"] = np.radians(ejes["phi"])
+    if "phi" in fijos:
+        fijos["phi"] = np.radians(fijos["phi"])
+
+    def progreso(hechos, total):
+        print(f"\rBloque {hechos}/{total}", end="", flush=True)
+
+    rutas = ejecutar_barrido(args.directorio, ejes, fijos, args.bloque, args.metodo, progreso)
+    print()
+    for nombre, ruta in rutas.items():
+        print(f"{nombre}: {ruta}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+import calculos
+
+def generar_escenarios(n, semilla=0, g=9.81):
+    """
+    Genera n escenarios válidos (intervalo no vacío y u óptima bajo el límite)
+    con un generador con semilla, para que la malla sea siempre la misma.
+    """
+    rng = np.random.default_rng(semilla)
+    escenarios = []
+    while len(escenarios) < n:
+        D = rng.uniform(30, 200)
+        h = rng.uniform(0, 60)
+        v = rng.uniform(10, 45)
+        phi = np.radians(rng.uniform(10, 80))
+        T = rng.uniform(0, 3)
+        t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
+        a, b = T + 0.1, t_max * 0.95
+        if b <= a:
+            continue
+        args = (D, h, v, phi, T, g)
+        tc_ref, u_ref = optimo_referencia(a, b, args)
+        if not np.isfinite(u_ref) or u_ref > calculos.LIMITE_VELOCIDAD_U:
+            continue
+        escenarios.append({'args': args, 'a': a, 'b': b, 'tc_ref': tc_ref, 'u_ref': u_ref})
+    return escenarios
+
+def optimo_referencia(a, b, args, n_malla=4001):
+    """
+    Óptimo de referencia independiente de los métodos medidos: malla fina de u(tc) en el
+    intervalo recortado a xA >= 0 y búsqueda dorada muy fina entre los vecinos del mejor punto.
+    """
+    D, h, v, phi, T, g = args
+    if v * np.cos(phi) > 0:
+        b = min(b, D / (v * np.cos(phi)))
+    malla = np.linspace(a, b, n_malla)
+    u_malla = calculos.funcion_velocidad_u_lote(malla, *args)
+    k = int(np.argmin(u_malla))
+    lo, hi = malla[max(k - 1, 0)], malla[min(k + 1, n_malla - 1)]
+    tc_ref, _ = calculos.minimizacion_seccion_dorada(calculos.funcion_velocidad_u, lo, hi, args,
+                                                     tol=1e-12, max_iter=500)
+    u_ref = calculos.funcion_velocidad_u(tc_ref, *args)
+    # La búsqueda sólo puede mejorar la malla; si no lo hace, se queda el punto de la malla
+    if not u_ref <= u_malla[k]:
+        tc_ref, u_ref = malla[k], u_malla[k]
+    return tc_ref, u_ref
+
+def medir_metodo(funcion_metodo, escenarios, repeticiones=5):
+    """Mide tiempo (perf_counter, mínimo de las repeticiones), evaluaciones, iteraciones y error."""
+    tiempos, evaluaciones, iteraciones, errores_tc, errores_u = [], [], [], [], []
+    for esc in escenarios:
+        a, b, args = esc['a'], esc['b'], esc['args']
+
+        # Conteo de evaluaciones en una llamada aparte, sin afectar el tiempo medido.
+        # Los métodos que no llaman a func (p. ej. Newton) informan sus propias evaluaciones.
+        contador = [0]
+        def func_contada(tc, *fargs):
+            contador[0] += 1
+            return calculos.funcion_velocidad_u(tc, *fargs)
+        resultado = funcion_metodo(func_contada, a, b, args)
+        tc, n_iter = resultado
+        if isinstance(resultado, calculos.ResultadoMinimizacion):
+            contador[0] = max(contador[0], resultado.evaluaciones)
+
+        mejor = float('inf')
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion_metodo(calculos.funcion_velocidad_u, a, b, args)
+            mejor = min(mejor, time.perf_counter() - inicio)
+
+        u = calculos.funcion_velocidad_u(tc, *args)
+        tiempos.append(mejor)
+        evaluaciones.append(contador[0])
+        iteraciones.append(n_iter)
+        errores_tc.append(abs(tc - esc['tc_ref']))
+        errores_u.append(abs(u - esc['u_ref']) / esc['u_ref'] if np.isfinite(u) else float('inf'))
+
+    # Los errores se calculan sólo sobre las soluciones finitas; las demás cuentan como fallos
+    errores_u = np.array(errores_u)
+    validos = np.isfinite(errores_u)
+    errores_tc = np.array(errores_tc)[validos] if validos.any() else np.array([np.nan])
+    return {
+        'tiempo_total_s': float(np.sum(tiempos)),
+        'tiempo_medio_s': float(np.mean(tiempos)),
+        'tiempo_p95_s': float(np.percentile(tiempos, 95)),
+        'evaluaciones_media': float(np.mean(evaluaciones)),
+        'evaluaciones_max': int(np.max(evaluaciones)),
+        'iteraciones_media': float(np.mean(iteraciones)),
+        'error_tc_medio': float(np.mean(errores_tc)),
+        'error_tc_max': float(np.max(errores_tc)),
+        'error_u_relativo_medio': float(np.mean(errores_u[validos])) if validos.any() else None,
+        'error_u_relativo_max': float(np.max(errores_u[validos])) if validos.any() else None,
+        'fallos': int(np.sum(~validos)),
+    }
+
+def ejecutar_benchmark(n_escenarios=200, repeticiones=5, semilla=0, metodos=None):
+    """Ejecuta todos los métodos (o los indicados) sobre la misma malla y retorna un dict serializable."""
+    escenarios = generar_escenarios(n_escenarios, semilla)
+    claves = metodos or list(calculos.METODOS_NUMERICOS)
+    resultados = {}
+    for clave in claves:
+        nombre, funcion_metodo = calculos.METODOS_NUMERICOS[clave]
+        resultados[clave] = dict(nombre=nombre, **medir_metodo(funcion_metodo, escenarios, repeticiones))
+    return {
+        'meta': {
+            'escenarios': n_escenarios,
+            'repeticiones': repeticiones,
+            'semilla': semilla,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'metodos': resultados,
+    }
+
+def main():
+    """Punto de entrada: python benchmark.py [--escenarios N] [--salida archivo.json]"""
+    parser = argparse.ArgumentParser(description="Benchmark de los métodos de minimización")
+    parser.add_argument("--escenarios", type=int, default=200, help="Número de escenarios de la malla")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por escenario")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la malla de escenarios")
+    parser.add_argument("--metodos", nargs="*", default=None, choices=list(calculos.METODOS_NUMERICOS),
+                        help=f"Métodos a medir (por defecto todos: {', '.join(calculos.METODOS_NUMERICOS)})")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de salida (por defecto, salida estándar)")
+    args = parser.parse_args()
+
+    informe = ejecutar_benchmark(args.escenarios, args.repeticiones, args.semilla, args.metodos)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,9 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 import numpy as np
 
 def posicion_proyectil_A(t, D, h, v, phi, g):
@@ -80,8 +86,54 @@ def encontrar_t_max_proyectil_A(h, v, phi, g):
 
 # --- MÉTODOS NUMÉRICOS OPTIMIZADOS ---
 
-def minimizacion_seccion_dorada(func, a, b, args, tol=1e-5, max_iter=100):
-    """Método de la Sección Dorada para minimización. Retorna (valor_optimo, iteraciones)"""
+@dataclass
+class ResultadoMinimizacion:
+    """
+    Resultado de un método de minimización. Se puede desempaquetar como
+    (valor_optimo, iteraciones) igual que antes.
+    """
+    valor_optimo: float
+    iteraciones: int
+    evaluaciones: int = 0
+    evaluaciones_infinitas: int = 0
+    motivo: str = ""
+    tiempo: float = 0.0
+    historial: list = field(default_factory=list)
+
+    def __iter__(self):
+        return iter((self.valor_optimo, self.iteraciones))
+
+class _FuncionInstrumentada:
+    """Envuelve la función objetivo para contar evaluaciones y cuántas dieron inf."""
+    def __init__(self, func):
+        self.func = func
+        self.evaluaciones = 0
+        self.infinitas = 0
+
+    def __call__(self, x, *args):
+        self.evaluaciones += 1
+        fx = self.func(x, *args)
+        if not np.isfinite(fx):
+            self.infinitas += 1
+        return fx
+
+def _registrar_iteracion(historial, callback, iteracion, a, b, x):
+    """Guarda el estado de una iteración y llama al callback opcional."""
+    paso = {'iteracion': iteracion, 'a': a, 'b': b, 'x': x}
+    historial.append(paso)
+    if callback is not None:
+        callback(paso)
+
+def _resultado(valor_optimo, iteraciones, func_inst, motivo, inicio, historial):
+    return ResultadoMinimizacion(valor_optimo, iteraciones, func_inst.evaluaciones, func_inst.infinitas,
+                                 motivo, time.perf_counter() - inicio, historial)
+
+def minimizacion_seccion_dorada(func, a, b, args, tol=1e-5, max_iter=100, callback=None):
+    """Método de la Sección Dorada para minimización. Retorna ResultadoMinimizacion"""
+    inicio = time.perf_counter()
+    func = _FuncionInstrumentada(func)
+    historial = []
+    motivo = "max_iter"
     gr = (np.sqrt(5) - 1) / 2
     c = b - gr * (b - a)
     d = a + gr * (b - a)
@@ -97,14 +149,20 @@ def minimizacion_seccion_dorada(func, a, b, args, tol=1e-5, max_iter=100):
             a = c
             c = d
             d = a + gr * (b - a)
+        _registrar_iteracion(historial, callback, i + 1, a, b, (a + b) / 2)
         if abs(b - a) < tol: 
+            motivo = "tolerancia"
             break
-    return (a + b) / 2, i + 1  
+    return _resultado((a + b) / 2, i + 1, func, motivo, inicio, historial)
 
-def minimizacion_metodo_secante(func, a, b, args, tol=1e-5, max_iter=100):
+def minimizacion_metodo_secante(func, a, b, args, tol=1e-5, max_iter=100, callback=None):
     """
-    Método de la Secante robusto. Retorna (valor_optimo, iteraciones)
+    Método de la Secante robusto. Retorna ResultadoMinimizacion
     """
+    inicio = time.perf_counter()
+    func = _FuncionInstrumentada(func)
+    historial = []
+    
     def derivada_aprox(t):
         h_step = 1e-5
         if t - h_step <= a or t + h_step >= b: return float('inf')
@@ -121,9 +179,10 @@ def minimizacion_metodo_secante(func, a, b, args, tol=1e-5, max_iter=100):
     for i in range(max_iter):
         f1 = derivada_aprox(x1)
         
-        if not np.isfinite(f1) or not np.isfinite(f0): return (x0 + x1) / 2, i + 1
-        if abs(f1 - f0) < 1e-12: break
-        if abs(f1 - f0) < 1e-15: return x1, i + 1
+        if not np.isfinite(f1) or not np.isfinite(f0):
+            return _resultado((x0 + x1) / 2, i + 1, func, "derivada_no_finita", inicio, historial)
+        if abs(f1 - f0) < 1e-12:
+            return _resultado(x1, i + 1, func, "derivada_plana", inicio, historial)
         
         try: 
             x_new = x1 - f1 * (x1 - x0) / (f1 - f0)
@@ -131,9 +190,745 @@ def minimizacion_metodo_secante(func, a, b, args, tol=1e-5, max_iter=100):
             x_new = (a + b) / 2
         
         if x_new < a or x_new > b: x_new = (a + b) / 2
+        _registrar_iteracion(historial, callback, i + 1, x1, x_new, x_new)
         
-        if abs(x_new - x1) < tol: return x_new, i + 1
+        if abs(x_new - x1) < tol:
+            return _resultado(x_new, i + 1, func, "tolerancia", inicio, historial)
         
         x0, x1, f0 = x1, x_new, f1
         
-    return x1, i + 1  
\ No newline at end of file
+    return _resultado(x1, i + 1, func, "max_iter", inicio, historial)
+
+def _limite_superior_factible(b, args):
+    """Recorta b para que A no pase el origen (xA >= 0), con margen de redondeo."""
+    D, _, v, phi, _, _ = args
+    v_cos = v * np.cos(phi)
+    return min(b, D / v_cos * (1 - 1e-12)) if v_cos > 0 else b
+
+def minimizacion_brent(func, a, b, args, tol=1e-5, max_iter=100, callback=None):
+    """
+    Método de Brent: interpolación parabólica con respaldo de Sección Dorada.
+    Evalúa la función una sola vez por iteración, sólo en la parte factible (xA >= 0)
+    del intervalo, y nunca toma un punto con u infinita como mejor punto.
+    Retorna ResultadoMinimizacion
+    """
+    inicio = time.perf_counter()
+    b_factible = _limite_superior_factible(b, args)
+    if b_factible < a:
+        resultado = minimizacion_seccion_dorada(func, a, b, args, tol, max_iter, callback)
+        resultado.motivo = f"degenerado ({resultado.motivo})"
+        return resultado
+    b = b_factible
+    func = _FuncionInstrumentada(func)
+    historial = []
+    motivo = "max_iter"
+    cgold = (3 - np.sqrt(5)) / 2
+    raiz_eps = np.sqrt(np.finfo(float).eps)
+    
+    x = w = v = a + cgold * (b - a)
+    fx = fw = fv = func(x, *args)
+    d = e = 0.0
+    
+    for i in range(max_iter):
+        m = (a + b) / 2
+        tol1 = raiz_eps * abs(x) + tol / 3
+        tol2 = 2 * tol1
+        if abs(x - m) <= tol2 - (b - a) / 2:
+            motivo = "tolerancia"
+            break
+        
+        # Intentar un paso parabólico por (v, w, x); sólo si los tres valores son finitos
+        paso_dorado = True
+        if abs(e) > tol1 and np.isfinite(fx) and np.isfinite(fw) and np.isfinite(fv):
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0: p = -p
+            q = abs(q)
+            e_anterior, e = e, d
+            if abs(p) < abs(0.5 * q * e_anterior) and q * (a - x) < p < q * (b - x):
+                d = p / q
+                u = x + d
+                if u - a < tol2 or b - u < tol2:
+                    d = tol1 if x < m else -tol1
+                paso_dorado = False
+        if paso_dorado:
+            e = (a - x) if x >= m else (b - x)
+            d = cgold * e
+        
+        u = x + d if abs(d) >= tol1 else x + (tol1 if d > 0 else -tol1)
+        fu = func(u, *args)
+        
+        if np.isfinite(fu) and fu <= fx:
+            if u < x: b = x
+            else: a = x
+            v, fv, w, fw, x, fx = w, fw, x, fx, u, fu
+        else:
+            if u < x: a = u
+            else: b = u
+            # Un punto sin colisión válida sólo acota el intervalo, no entra en la parábola
+            if not np.isfinite(fu):
+                pass
+            elif fu <= fw or w == x:
+                v, fv, w, fw = w, fw, u, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+        _registrar_iteracion(historial, callback, i + 1, a, b, x)
+    
+    return _resultado(x, i + 1, func, motivo, inicio, historial)
+
+def coeficientes_velocidad_cuadrada(D, h, v, phi, T, g):
+    """
+    Coeficientes (A, B, C) tales que u(tc)^2 = A*w^2 + 2*B*w + C con w = 1/(tc - T).
+    La altura relativa que B debe cubrir es lineal en tc, por eso u^2 es cuadrática en w.
+    """
+    v_cos, v_sin = v * np.cos(phi), v * np.sin(phi)
+    p0, p1 = D - v_cos * T, -v_cos
+    q0, q1 = h + v_sin * T - 0.5 * g * T**2, v_sin - g * T
+    return p0**2 + q0**2, p0 * p1 + q0 * q1, p1**2 + q1**2
+
+def minimizacion_analitica(func, a, b, args, tol=1e-5, max_iter=100, callback=None):
+    """
+    Mínimo exacto de u(tc) en [a, b] a partir de la forma cuadrática en w = 1/(tc - T).
+    Si el caso es degenerado recurre a la Sección Dorada. Retorna ResultadoMinimizacion
+    """
+    inicio = time.perf_counter()
+    D, h, v, phi, T, g = args
+    A, B, _ = coeficientes_velocidad_cuadrada(D, h, v, phi, T, g)
+
+    # Límite superior factible: A no debe pasar el origen (xA >= 0), con margen de redondeo
+    tc_sup = _limite_superior_factible(b, args)
+
+    escala = max(D, h, 1.0) ** 2
+    if not (np.isfinite(A) and np.isfinite(B)) or A <= 1e-12 * escala or tc_sup < a:
+        resultado = minimizacion_seccion_dorada(func, a, b, args, tol, max_iter, callback)
+        resultado.motivo = f"degenerado ({resultado.motivo})"
+        resultado.tiempo = time.perf_counter() - inicio
+        return resultado
+
+    # u^2 es convexa en w: mínimo en w = -B/A si B < 0; si no, u decrece hasta el borde superior
+    tc = T + A / -B if B < 0 else tc_sup
+    tc = float(min(max(tc, a), tc_sup))
+    historial = []
+    _registrar_iteracion(historial, callback, 0, a, tc_sup, tc)
+    return ResultadoMinimizacion(tc, 0, 0, 0, "forma_cerrada", time.perf_counter() - inicio, historial)
+
+def derivadas_velocidad_u(tc, D, h, v, phi, T, g):
+    """
+    Retorna (u, du/dtc, d2u/dtc2) exactas a partir de u^2 = A*w^2 + 2*B*w + C, w = 1/(tc - T).
+    Fuera de la región válida retorna (inf, nan, nan), igual que funcion_velocidad_u.
+    """
+    u = funcion_velocidad_u(tc, D, h, v, phi, T, g)
+    if not np.isfinite(u) or u <= 0:
+        return float('inf'), float('nan'), float('nan')
+    A, B, _ = coeficientes_velocidad_cuadrada(D, h, v, phi, T, g)
+    w = 1.0 / (tc - T)
+    dF = -2 * w**2 * (A * w + B)
+    d2F = w**3 * (6 * A * w + 4 * B)
+    du = dF / (2 * u)
+    d2u = (d2F - 2 * du**2) / (2 * u)
+    return u, du, d2u
+
+def minimizacion_newton(func, a, b, args, tol=1e-5, max_iter=100, callback=None):
+    """
+    Método de Newton salvaguardado sobre du/dtc = 0 con derivadas analíticas.
+    Mantiene un intervalo que contiene al mínimo y usa bisección si el paso de Newton
+    sale de él o la curvatura no es positiva. `func` sólo se usa si el caso es degenerado.
+    Retorna ResultadoMinimizacion
+    """
+    inicio = time.perf_counter()
+    historial = []
+    contador = {'evaluaciones': 0, 'infinitas': 0}
+    
+    def evaluar(t):
+        contador['evaluaciones'] += 1
+        resultado = derivadas_velocidad_u(t, *args)
+        if not np.isfinite(resultado[0]):
+            contador['infinitas'] += 1
+        return resultado
+    
+    def terminar(x, iteraciones, motivo):
+        return ResultadoMinimizacion(float(x), iteraciones, contador['evaluaciones'], contador['infinitas'],
+                                     motivo, time.perf_counter() - inicio, historial)
+    
+    # Intervalo factible: A no debe pasar el origen (xA >= 0)
+    lo = a
+    hi = _limite_superior_factible(b, args)
+    if hi < lo:
+        resultado = minimizacion_seccion_dorada(func, a, b, args, tol, max_iter, callback)
+        resultado.motivo = f"degenerado ({resultado.motivo})"
+        return resultado
+    
+    # u es unimodal en tc: si la derivada no cambia de signo el mínimo está en un borde
+    _, du_hi, _ = evaluar(hi)
+    if np.isfinite(du_hi) and du_hi <= 0:
+        _registrar_iteracion(historial, callback, 0, lo, hi, hi)
+        return terminar(hi, 0, "borde_superior")
+    _, du_lo, _ = evaluar(lo)
+    if np.isfinite(du_lo) and du_lo >= 0:
+        _registrar_iteracion(historial, callback, 0, lo, hi, lo)
+        return terminar(lo, 0, "borde_inferior")
+    
+    x = (lo + hi) / 2
+    motivo = "max_iter"
+    for i in range(max_iter):
+        _, du, d2u = evaluar(x)
+        if not np.isfinite(du):
+            hi = x
+            x_nuevo = (lo + hi) / 2
+        else:
+            if du > 0: hi = x
+            else: lo = x
+            x_nuevo = x - du / d2u if d2u > 0 else None
+            # Sin curvatura positiva o si el paso sale del intervalo, bisección
+            if x_nuevo is None or not (lo < x_nuevo < hi):
+                x_nuevo = (lo + hi) / 2
+        _registrar_iteracion(historial, callback, i + 1, lo, hi, x_nuevo)
+        
+        if abs(x_nuevo - x) < tol or hi - lo < tol:
+            x = x_nuevo
+            motivo = "tolerancia"
+            break
+        x = x_nuevo
+    
+    return terminar(x, i + 1, motivo)
+
+# Métodos disponibles: clave -> (nombre visible, función de minimización)
+METODOS_NUMERICOS = {
+    "golden": ("Sección Dorada", minimizacion_seccion_dorada),
+    "secant": ("Secante", minimizacion_metodo_secante),
+    "brent": ("Brent", minimizacion_brent),
+    "newton": ("Newton", minimizacion_newton),
+    "analitico": ("Analítico", minimizacion_analitica),
+}
+
+LIMITE_VELOCIDAD_U = 450
+
+def metodo_numerico(metodo):
+    """(nombre visible, función) del método indicado; lanza ValueError si no existe."""
+    try:
+        return METODOS_NUMERICOS[metodo]
+    except KeyError:
+        raise ValueError(f"Método desconocido: {metodo} (disponibles: {', '.join(METODOS_NUMERICOS)})") from None
+
+# Campos que debe tener una solución leída del archivo de la caché
+_CAMPOS_SOLUCION = frozenset(('D', 'h', 'v', 'phi', 'T', 'g', 'u', 'theta', 'tc',
+                              'x_col', 'y_col', 'metodo', 'iteraciones'))
+
+class CacheSoluciones:
+    """
+    Caché LRU acotada de escenarios resueltos, indexada por (D, h, v, phi, T, g, método).
+    Las claves se redondean a `decimales` cifras decimales (phi en radianes).
+    Si se da `ruta`, el archivo JSON se carga en la primera consulta y se escribe con persistir().
+    """
+    def __init__(self, capacidad=1024, ruta=None, decimales=6):
+        self.capacidad = capacidad
+        self.ruta = ruta
+        self.decimales = decimales
+        self._datos = OrderedDict()
+        self._cargado = ruta is None
+        self._candado = threading.Lock()
+
+    def clave(self, D, h, v, phi, T, g, metodo):
+        """Clave redondeada de un escenario."""
+        return tuple(round(float(x), self.decimales) for x in (D, h, v, phi, T, g)) + (metodo,)
+
+    def _cargar(self):
+        """
+        Lee el archivo de la caché una sola vez; si no existe, está dañado o no tiene la
+        forma [[clave, solución], ...] empieza vacía.
+        """
+        self._cargado = True
+        try:
+            with open(self.ruta, encoding="utf-8") as f:
+                entradas = json.load(f)
+            datos = OrderedDict()
+            for clave, solucion in entradas:
+                if not isinstance(solucion, dict) or not _CAMPOS_SOLUCION <= solucion.keys():
+                    raise ValueError("entrada de caché incompleta")
+                datos[tuple(clave)] = solucion
+        except (OSError, ValueError, TypeError):
+            return
+        self._datos.update(datos)
+        while len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+
+    def obtener(self, clave):
+        """Retorna una copia de la solución guardada o None."""
+        with self._candado:
+            if not self._cargado:
+                self._cargar()
+            solucion = self._datos.get(clave)
+            if solucion is None:
+                return None
+            self._datos.move_to_end(clave)
+            return dict(solucion)
+
+    def guardar(self, clave, solucion):
+        """Guarda una solución, descartando la menos usada si se supera la capacidad."""
+        datos = {k: (float(x) if isinstance(x, (float, np.floating)) else x) for k, x in solucion.items()}
+        with self._candado:
+            if not self._cargado:
+                self._cargar()
+            self._datos[clave] = datos
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def persistir(self):
+        """Escribe la caché en disco (de forma atómica) si tiene ruta."""
+        if self.ruta is None:
+            return
+        with self._candado:
+            if not self._cargado:
+                return
+            entradas = [[list(clave), solucion] for clave, solucion in self._datos.items()]
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(entradas, f)
+        os.replace(temporal, self.ruta)
+
+    def __len__(self):
+        return len(self._datos)
+
+def _intervalo_busqueda(h, v, phi, T, g, margen_inf=0.1, factor_sup=0.95):
+    """Intervalo [T + margen, factor * t_max] donde se busca tc; lanza ValueError si es vacío."""
+    t_max = encontrar_t_max_proyectil_A(h, v, phi, g)
+    if t_max is None or t_max <= 0:
+        raise ValueError("No se pudo calcular t_max válido.")
+    
+    a, b = T + margen_inf, t_max * factor_sup
+    if b <= a:
+        raise ValueError(f"Intervalo inválido: T={T:.2f} es muy cercano a t_max={t_max:.2f}")
+    return a, b
+
+def _construir_solucion(tc_optimo, args, nombre_metodo, iteraciones):
+    """Valida tc y u y arma el diccionario de la solución; lanza ValueError si no sirve."""
+    D, h, v, phi, T, g = args
+    if not np.isfinite(tc_optimo) or tc_optimo <= T:
+        raise ValueError("No se encontró tc válido.")
+    
+    u_optimo = funcion_velocidad_u(tc_optimo, *args)
+    if not np.isfinite(u_optimo) or u_optimo > LIMITE_VELOCIDAD_U:
+        raise ValueError(f"Velocidad u excesiva ({u_optimo:.1f} m/s).")
+    
+    theta_optimo = funcion_angulo_theta(tc_optimo, *args)
+    x_col, y_col = posicion_proyectil_A(tc_optimo, D, h, v, phi, g)
+    return {
+        'D': D, 'h': h, 'v': v, 'phi': phi, 'T': T, 'g': g,
+        'u': u_optimo, 'theta': theta_optimo, 'tc': tc_optimo,
+        'x_col': x_col, 'y_col': y_col,
+        'metodo': nombre_metodo, 'iteraciones': iteraciones,
+    }
+
+def resolver_intercepcion(D, h, v, phi, T, g=9.81, metodo="golden", cache=None):
+    """
+    Resuelve un escenario completo con el método indicado (phi en radianes).
+    Retorna un diccionario con tc, u, theta, la colisión y las iteraciones.
+    Si se pasa una CacheSoluciones, reutiliza las soluciones ya calculadas.
+    Lanza ValueError si el método no existe o si el escenario no tiene solución válida.
+    """
+    nombre_metodo, funcion_metodo = metodo_numerico(metodo)
+    if cache is not None:
+        clave = cache.clave(D, h, v, phi, T, g, metodo)
+        solucion = cache.obtener(clave)
+        if solucion is not None:
+            solucion['desde_cache'] = True
+            return solucion
+    
+    a, b = _intervalo_busqueda(h, v, phi, T, g)
+    args = (D, h, v, phi, T, g)
+    tc_optimo, iteraciones = funcion_metodo(funcion_velocidad_u, a, b, args)
+    
+    solucion = _construir_solucion(tc_optimo, args, nombre_metodo, iteraciones)
+    if cache is not None:
+        cache.guardar(clave, solucion)
+    return solucion
+
+def resolver_continuacion(escenarios, g=9.81, metodo="golden", tol=1e-5, ancho_minimo=None, max_ampliaciones=4):
+    """
+    Resuelve una secuencia de escenarios (D, h, v, phi, T) que varían poco de uno a otro.
+    Cada búsqueda parte del óptimo anterior, extrapolado con los últimos, en un intervalo
+    estrecho dentro del intervalo completo. Su semiancho es el error esperado de la
+    extrapolación (4 veces la última diferencia, o la segunda diferencia cuando hay tres
+    óptimos), y al menos ancho_minimo (20 * tol por defecto).
+    Salvaguardas: la predicción se recorta al intervalo completo del escenario (que cambia
+    con la factibilidad); si el óptimo queda pegado a un borde interior del intervalo
+    estrecho, o ese borde da una u menor, el intervalo se amplía (x4) hasta
+    max_ampliaciones veces, y si aún así no hay solución válida se repite la búsqueda completa.
+    Cada vez que la continuación termina en búsqueda completa, los siguientes escenarios se
+    resuelven directamente con el intervalo completo (1, 2, 4... escenarios, hasta que vuelva
+    a funcionar), para que un método que casi nunca la aprovecha (p. ej. la Secante) no pague
+    el intento fallido en cada escenario.
+    Genera un diccionario como el de resolver_intercepcion por escenario (con 'evaluaciones'
+    y 'arranque' = 'continuacion' o 'completo'), o None si el escenario no tiene solución;
+    tras un None la continuación vuelve a empezar desde cero.
+    """
+    nombre_metodo, funcion_metodo = metodo_numerico(metodo)
+    ancho_minimo = 20 * tol if ancho_minimo is None else ancho_minimo
+    # Newton y la forma cerrada ya comprueban el signo de la derivada en los bordes
+    verificar_bordes = metodo not in ("newton", "analitico")
+    historia = []
+    pausa, siguiente_pausa = 0, 1
+    for escenario in escenarios:
+        D, h, v, phi, T = (float(x) for x in escenario)
+        args = (D, h, v, phi, T, g)
+        try:
+            a, b = _intervalo_busqueda(h, v, phi, T, g)
+        except ValueError:
+            historia = []
+            yield None
+            continue
+        
+        evaluaciones = 0
+        solucion = None
+        intento = bool(historia) and pausa == 0
+        pausa = max(0, pausa - 1)
+        if intento:
+            if len(historia) == 1:
+                prediccion, error = historia[-1], ancho_minimo
+            else:
+                prediccion = 2 * historia[-1] - historia[-2]
+                if len(historia) == 3:
+                    error = 4 * abs(historia[-1] - 2 * historia[-2] + historia[-3])
+                else:
+                    error = 4 * abs(historia[-1] - historia[-2])
+            prediccion = min(max(prediccion, a), b)
+            semiancho = max(ancho_minimo, error)
+            for _ in range(max_ampliaciones + 1):
+                lo, hi = max(a, prediccion - semiancho), min(b, prediccion + semiancho)
+                resultado = funcion_metodo(funcion_velocidad_u, lo, hi, args, tol)
+                evaluaciones += resultado.evaluaciones
+                tc = resultado.valor_optimo
+                u_tc = funcion_velocidad_u(tc, *args)
+                # En un borde interior el mínimo no puede estar pegado a él ni ser peor que él
+                pegado = False
+                for borde, interior in ((lo, lo > a), (hi, hi < b)):
+                    if not interior:
+                        continue
+                    if abs(tc - borde) < 2 * tol:
+                        pegado = True
+                    elif verificar_bordes:
+                        evaluaciones += 1
+                        pegado = pegado or funcion_velocidad_u(borde, *args) < u_tc
+                if not pegado and np.isfinite(u_tc):
+                    try:
+                        solucion = _construir_solucion(tc, args, nombre_metodo, resultado.iteraciones)
+                        solucion['arranque'] = 'continuacion'
+                    except ValueError:
+                        pass
+                    break
+                semiancho *= 4
+            if solucion is None:
+                pausa, siguiente_pausa = siguiente_pausa, 2 * siguiente_pausa
+            else:
+                siguiente_pausa = 1
+        
+        if solucion is None:
+            resultado = funcion_metodo(funcion_velocidad_u, a, b, args, tol)
+            evaluaciones += resultado.evaluaciones
+            try:
+                solucion = _construir_solucion(resultado.valor_optimo, args, nombre_metodo, resultado.iteraciones)
+                solucion['arranque'] = 'completo'
+            except ValueError:
+                historia = []
+                yield None
+                continue
+        
+        solucion['evaluaciones'] = evaluaciones
+        historia = (historia + [solucion['tc']])[-3:]
+        yield solucion
+
+def recalcular_intercepcion(pA, vA, pB, vB, t, tc_previo, tc_limite=float('inf')):
+    """
+    Re-apunta B desde los estados actuales (con ruido) de A y B en el instante t.
+    La gravedad se cancela en el movimiento relativo, así que B intercepta a A en tc
+    si su velocidad es vA + (pA - pB) / (tc - t). Se elige en forma cerrada el tc que
+    requiere la menor corrección respecto a vB, sin pasar de tc_limite; si A y B no se
+    acercan, se mantiene tc_previo. Retorna (tc, vBx, vBy), o None si ya no queda
+    tiempo para corregir.
+    """
+    rx, ry = pA[0] - pB[0], pA[1] - pB[1]
+    wx, wy = vA[0] - vB[0], vA[1] - vB[1]
+    r2 = rx * rx + ry * ry
+    acercamiento = -(rx * wx + ry * wy)
+    tau = r2 / acercamiento if acercamiento > 0 else tc_previo - t
+    tau = min(tau, tc_limite - t)
+    if not tau > 0:
+        return None
+    return t + tau, vA[0] + rx / tau, vA[1] + ry / tau
+
+# --- VERSIONES VECTORIZADAS (LOTES DE ESCENARIOS) ---
+
+def _componentes_velocidad_lote(tc, D, h, v_cos, v_sin, T, g):
+    """Componentes (ux, uy) de B y posición (xA, yA) de A para arreglos de escenarios."""
+    xA = D - v_cos * tc
+    yA = h + v_sin * tc - 0.5 * g * tc**2
+    delta_t = tc - T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ux = xA / delta_t
+        uy = (yA + 0.5 * g * delta_t**2) / delta_t
+    return ux, uy, xA, yA
+
+def _velocidad_u_lote(tc, D, h, v_cos, v_sin, T, g):
+    """Núcleo de funcion_velocidad_u_lote con cos(phi) y sin(phi) ya calculados."""
+    ux, uy, xA, yA = _componentes_velocidad_lote(tc, D, h, v_cos, v_sin, T, g)
+    u = np.hypot(ux, uy)
+    invalido = (tc <= T + 0.001) | (xA < 0) | (yA < 0) | ~np.isfinite(u)
+    return np.where(invalido, np.inf, u)
+
+def funcion_velocidad_u_lote(tc, D, h, v, phi, T, g):
+    """Versión vectorizada de funcion_velocidad_u. Retorna inf donde no hay colisión válida."""
+    tc, D, h, v, phi, T, g = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (tc, D, h, v, phi, T, g)])
+    return _velocidad_u_lote(tc, D, h, v * np.cos(phi), v * np.sin(phi), T, g)
+
+def funcion_angulo_theta_lote(tc, D, h, v, phi, T, g):
+    """Versión vectorizada de funcion_angulo_theta."""
+    tc, D, h, v, phi, T, g = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (tc, D, h, v, phi, T, g)])
+    ux, uy, _, _ = _componentes_velocidad_lote(tc, D, h, v * np.cos(phi), v * np.sin(phi), T, g)
+    theta = np.arctan2(uy, ux)
+    return np.where((tc <= T + 0.001) | ~np.isfinite(theta), np.radians(45.0), theta)
+
+def encontrar_t_max_proyectil_A_lote(h, v, phi, g):
+    """Versión vectorizada de encontrar_t_max_proyectil_A (0 donde no hay raíz real)."""
+    a = 0.5 * np.asarray(g, dtype=float)
+    b = -np.asarray(v, dtype=float) * np.sin(phi)
+    c = -np.asarray(h, dtype=float)
+    discriminante = b**2 - 4 * a * c
+    t = (-b + np.sqrt(np.maximum(discriminante, 0.0))) / (2 * a)
+    return np.where(discriminante < 0, 0.0, t)
+
+def _seccion_dorada_lote(a, b, activo, args, tol, max_iter):
+    """Sección Dorada en paralelo sobre las filas activas; retorna el punto medio final."""
+    gr = (np.sqrt(5) - 1) / 2
+    c = b - gr * (b - a)
+    d = a + gr * (b - a)
+    fc = _velocidad_u_lote(c, *args)
+    fd = _velocidad_u_lote(d, *args)
+    activo = activo.copy()
+
+    for _ in range(max_iter):
+        if not activo.any():
+            break
+        izquierda = fc < fd
+        # Lado izquierdo: b <- d, d <- c, nuevo c. Lado derecho: a <- c, c <- d, nuevo d.
+        b = np.where(activo & izquierda, d, b)
+        a = np.where(activo & ~izquierda, c, a)
+        nuevo_c = b - gr * (b - a)
+        nuevo_d = a + gr * (b - a)
+        punto = np.where(izquierda, nuevo_c, nuevo_d)
+        f_punto = _velocidad_u_lote(punto, *args)
+
+        c_sig = np.where(izquierda, nuevo_c, d)
+        d_sig = np.where(izquierda, c, nuevo_d)
+        fc_sig = np.where(izquierda, f_punto, fd)
+        fd_sig = np.where(izquierda, fc, f_punto)
+        c = np.where(activo, c_sig, c)
+        d = np.where(activo, d_sig, d)
+        fc = np.where(activo, fc_sig, fc)
+        fd = np.where(activo, fd_sig, fd)
+        activo &= np.abs(b - a) >= tol
+
+    return (a + b) / 2
+
+# Métodos con versión vectorizada en resolver_lote
+METODOS_LOTE = ("golden", "analitico")
+
+def resolver_lote(D, h, v, phi, T, g=9.81, tol=1e-5, max_iter=100, margen_inf=0.1, factor_sup=0.95,
+                  metodo="golden"):
+    """
+    Resuelve muchos escenarios a la vez con el mismo intervalo [T + margen_inf, factor_sup * t_max]
+    que la interfaz. Con metodo="golden" la Sección Dorada avanza en paralelo y reutiliza en cada
+    iteración una de las dos evaluaciones de la anterior; con metodo="analitico" se usa la forma
+    cerrada de minimizacion_analitica y la Sección Dorada sólo en las filas degeneradas.
+    Retorna (tc, u, theta) como arreglos; NaN donde el intervalo no es válido.
+    Lanza ValueError si el método no tiene versión vectorizada.
+    """
+    if metodo not in METODOS_LOTE:
+        raise ValueError(f"Método sin versión vectorizada: {metodo} (disponibles: {', '.join(METODOS_LOTE)})")
+    D, h, v, phi, T, g = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (D, h, v, phi, T, g)])
+    v_cos, v_sin = v * np.cos(phi), v * np.sin(phi)
+    args = (D, h, v_cos, v_sin, T, g)
+
+    t_max = encontrar_t_max_proyectil_A_lote(h, v, phi, g)
+    a = T + margen_inf
+    b = t_max * factor_sup
+    valido = b > a
+    a = np.where(valido, a, 0.0)
+    b = np.where(valido, b, 0.0)
+
+    if metodo == "analitico":
+        A, B, _ = coeficientes_velocidad_cuadrada(D, h, v, phi, T, g)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tc_sup = np.where(v_cos > 0, np.minimum(b, D / v_cos * (1 - 1e-12)), b)
+            tc = np.where(B < 0, T + A / -B, tc_sup)
+        tc = np.minimum(np.maximum(tc, a), tc_sup)
+        escala = np.maximum(np.maximum(D, h), 1.0) ** 2
+        degenerado = valido & (~np.isfinite(A) | ~np.isfinite(B) | (A <= 1e-12 * escala) | (tc_sup < a))
+        if degenerado.any():
+            # Sólo las filas degeneradas pasan por la búsqueda iterativa
+            filas = np.nonzero(degenerado)
+            args_filas = tuple(x[filas] for x in args)
+            tc[filas] = _seccion_dorada_lote(a[filas], b[filas], np.ones(len(filas[0]), dtype=bool),
+                                             args_filas, tol, max_iter)
+    else:
+        tc = _seccion_dorada_lote(a, b, valido, args, tol, max_iter)
+
+    tc = np.where(valido, tc, np.nan)
+    u = _velocidad_u_lote(tc, *args)
+    ux, uy, _, _ = _componentes_velocidad_lote(tc, *args)
+    theta = np.arctan2(uy, ux)
+    u = np.where(valido, u, np.nan)
+    theta = np.where(valido, theta, np.nan)
+    return tc, u, theta
+
+def recalcular_intercepcion_lote(pA, vA, pB, vB, t, tc_previo, tc_limite=np.inf):
+    """
+    Versión vectorizada de recalcular_intercepcion para estados (N, 2).
+    Retorna (tc, vB_requerida) con NaN en las filas donde ya no hay corrección posible.
+    """
+    r = pA - pB
+    acercamiento = -np.sum(r * (vA - vB), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau = np.where(acercamiento > 0, np.sum(r * r, axis=1) / acercamiento, tc_previo - t)
+    tau = np.minimum(tau, tc_limite - t)
+    tau = np.where(tau > 0, tau, np.nan)
+    return t + tau, vA + r / tau[:, None]
+
+# --- VARIOS OBJETIVOS Y VARIOS INTERCEPTORES ---
+
+def matriz_costos_intercepcion(D, h, v, phi, x_lanzador, T_lanzador, g=9.81, metodo="analitico"):
+    """
+    Velocidad mínima de cada interceptor j contra cada objetivo i, todo vectorizado.
+    Objetivos: arreglos (N,) D, h, v, phi como en el caso de un solo proyectil A.
+    Interceptores: arreglos (M,) con la posición x_lanzador (en el suelo) y el retardo
+    T_lanzador de cada sitio. Retorna (u, tc, theta) de forma (N, M); u es inf donde
+    no hay intercepción válida o se supera LIMITE_VELOCIDAD_U.
+    """
+    D, h, v, phi = (np.asarray(x, dtype=float).reshape(-1, 1) for x in (D, h, v, phi))
+    x_lanzador, T_lanzador = (np.asarray(x, dtype=float).reshape(1, -1) for x in (x_lanzador, T_lanzador))
+    # Cada pareja es el problema de siempre con B en el origen: A a distancia D - x_lanzador
+    D_rel, h, v, phi, T = np.broadcast_arrays(D - x_lanzador, h, v, phi, T_lanzador)
+
+    u = np.full(D_rel.shape, np.inf)
+    tc = np.full(D_rel.shape, np.nan)
+    theta = np.full(D_rel.shape, np.nan)
+    # A ya pasó (o está sobre) el sitio de lanzamiento: no hay intercepción posible
+    candidatos = D_rel > 0
+    if candidatos.any():
+        tc_c, u_c, theta_c = resolver_lote(D_rel[candidatos], h[candidatos], v[candidatos],
+                                           phi[candidatos], T[candidatos], g, metodo=metodo)
+        factible = np.isfinite(u_c) & (u_c <= LIMITE_VELOCIDAD_U)
+        u[candidatos] = np.where(factible, u_c, np.inf)
+        tc[candidatos] = np.where(factible, tc_c, np.nan)
+        theta[candidatos] = np.where(factible, theta_c, np.nan)
+    return u, tc, theta
+
+def asignacion_hungara(costos):
+    """
+    Asignación de costo mínimo de una matriz finita n x m (algoritmo húngaro con
+    caminos de aumento más cortos, O(n^2 m), con el bucle interior vectorizado).
+    Retorna (filas, columnas) de las min(n, m) parejas asignadas.
+    """
+    costos = np.asarray(costos, dtype=float)
+    transpuesta = costos.shape[0] > costos.shape[1]
+    if transpuesta:
+        costos = costos.T
+    n, m = costos.shape
+    # Potenciales de filas y columnas; la columna 0 es ficticia y los índices empiezan en 1
+    pot_fila = np.zeros(n + 1)
+    pot_col = np.zeros(m + 1)
+    fila_de_col = np.zeros(m + 1, dtype=int)
+    anterior = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        fila_de_col[0] = i
+        j0 = 0
+        minimo = np.full(m + 1, np.inf)
+        usada = np.zeros(m + 1, dtype=bool)
+        while True:
+            usada[j0] = True
+            i0 = fila_de_col[j0]
+            libre = ~usada
+            libre[0] = False
+            reducido = np.full(m + 1, np.inf)
+            reducido[1:] = costos[i0 - 1] - pot_fila[i0] - pot_col[1:]
+            mejora = libre & (reducido < minimo)
+            minimo[mejora] = reducido[mejora]
+            anterior[mejora] = j0
+            j1 = int(np.argmin(np.where(libre, minimo, np.inf)))
+            delta = minimo[j1]
+            pot_fila[fila_de_col[usada]] += delta
+            pot_col[usada] -= delta
+            minimo[libre] -= delta
+            j0 = j1
+            if fila_de_col[j0] == 0:
+                break
+        # Aumentar a lo largo del camino encontrado
+        while j0:
+            j1 = anterior[j0]
+            fila_de_col[j0] = fila_de_col[j1]
+            j0 = j1
+
+    columnas = np.flatnonzero(fila_de_col[1:])
+    filas = fila_de_col[1:][columnas] - 1
+    if transpuesta:
+        filas, columnas = columnas, filas
+    orden = np.argsort(filas)
+    return filas[orden], columnas[orden]
+
+def asignar_intercepciones(D, h, v, phi, x_lanzador, T_lanzador, g=9.81, metodo="analitico"):
+    """
+    Asigna a lo sumo un interceptor por objetivo (y un objetivo por interceptor)
+    maximizando primero el número de intercepciones factibles y, entre ellas,
+    minimizando la suma de velocidades u. Retorna un diccionario con las parejas
+    ('objetivo', 'interceptor', 'u', 'tc', 'theta'), 'costo_total', los objetivos
+    'sin_asignar' y la matriz 'costos' completa.
+    """
+    costos, tc, theta = matriz_costos_intercepcion(D, h, v, phi, x_lanzador, T_lanzador, g, metodo)
+    finitos = np.isfinite(costos)
+    # Una pareja imposible cuesta más que cualquier asignación factible completa
+    penalizacion = (costos[finitos].max() + 1.0) * (min(costos.shape) + 1) if finitos.any() else 1.0
+    filas, columnas = asignacion_hungara(np.where(finitos, costos, penalizacion))
+    factibles = finitos[filas, columnas]
+    filas, columnas = filas[factibles], columnas[factibles]
+    return {
+        'objetivo': filas,
+        'interceptor': columnas,
+        'u': costos[filas, columnas],
+        'tc': tc[filas, columnas],
+        'theta': theta[filas, columnas],
+        'costo_total': float(costos[filas, columnas].sum()),
+        'sin_asignar': np.setdiff1d(np.arange(costos.shape[0]), filas),
+        'costos': costos,
+    }
+
+# --- CURVA u(tc) PARA LA VISTA PREVIA ---
+
+def curva_velocidad_u(D, h, v, phi, T, g=9.81, n_puntos=300):
+    """
+    Muestrea u(tc) en el intervalo de búsqueda [T + 0.1, 0.95 t_max] con la versión vectorizada.
+    Retorna un diccionario con 'a', 'b', la malla 'tc' y 'u' (inf donde no hay colisión válida).
+    Lanza ValueError si el intervalo es vacío.
+    """
+    a, b = _intervalo_busqueda(h, v, phi, T, g)
+    tc = np.linspace(a, b, n_puntos)
+    return {'a': a, 'b': b, 'tc': tc, 'u': funcion_velocidad_u_lote(tc, D, h, v, phi, T, g)}
+
+def iterados_metodo(D, h, v, phi, T, g, a, b, metodo="golden"):
+    """
+    Ejecuta el método indicado en [a, b] y retorna su óptimo y los puntos que fue visitando
+    ('tc_optimo', 'u_optimo', 'iterados_tc', 'iterados_u', 'iteraciones', 'motivo').
+    """
+    args = (D, h, v, phi, T, g)
+    _, funcion_metodo = metodo_numerico(metodo)
+    resultado = funcion_metodo(funcion_velocidad_u, a, b, args)
+    iterados_tc = np.array([paso['x'] for paso in resultado.historial], dtype=float)
+    return {
+        'tc_optimo': resultado.valor_optimo,
+        'u_optimo': funcion_velocidad_u(resultado.valor_optimo, *args),
+        'iterados_tc': iterados_tc,
+        'iterados_u': funcion_velocidad_u_lote(iterados_tc, *args),
+        'iteraciones': resultado.iteraciones,
+        'motivo': resultado.motivo,
+    }
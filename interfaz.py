@@ -2,20 +2,49 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import calculos
 import simulacion
 
 class InterfazSimulacionProyectiles:
-    def __init__(self, ventana_principal):
-        """Inicializa la interfaz gráfica de la simulación."""
+    def __init__(self, ventana_principal, ruta_cache=None):
+        """
+        Inicializa la interfaz gráfica de la simulación. Las soluciones calculadas se
+        guardan en memoria; sólo se leen y escriben en disco si se da ruta_cache.
+        """
         self.ventana_principal = ventana_principal
         self.ventana_principal.title("Simulación de Colisión de Proyectiles")
-        self.ventana_principal.geometry("950x720")
+        self.ventana_principal.geometry("1400x720")
         
         self.g = 9.81
         self.solucion_calculada = None
         self.escenarios_unificados = []  # Lista única de escenarios
         
+        # Soluciones ya calculadas; entre sesiones sólo si se pidió un archivo
+        self.cache_soluciones = calculos.CacheSoluciones(capacidad=512, ruta=ruta_cache)
+        
+        # Trabajos pesados en un hilo aparte; los resultados vuelven con after()
+        self.ejecutor = ThreadPoolExecutor(max_workers=1)
+        self.trabajo_actual = None
+        self.evento_cancelar = threading.Event()
+        self.progreso_trabajo = 0.0
+        self.ventana_principal.protocol("WM_DELETE_WINDOW", self.cerrar_ventana)
+        
+        # Una sola figura embebida para todas las simulaciones (se crea al primer uso)
+        self.figura = None
+        self.lienzo = None
+        self.vista_trayectorias = None
+        self.animacion = None
+        
+        # Vista previa de u(tc): se recalcula poco después de la última edición
+        self.figura_previa = None
+        self.lienzo_previa = None
+        self.lineas_previa = None
+        self.vista_previa_pendiente = None
+        self.curva_previa = None      # (parámetros, curva) de la última malla calculada
+        self.iterados_previa = None   # (método, iterados) sobre esa misma malla
+        
         self.crear_widgets()
         
     def crear_widgets(self):
@@ -90,6 +119,9 @@ class InterfazSimulacionProyectiles:
         self.entrada_T.insert(0, "2.0")
         self.entrada_T.grid(row=2, column=1, padx=5)
         
+        for entrada in (self.entrada_D, self.entrada_h, self.entrada_v, self.entrada_phi, self.entrada_T):
+            entrada.bind('<KeyRelease>', self.programar_vista_previa)
+        
         # Parámetros de simulación
         marco_sim = ttk.LabelFrame(marco_principal, text="Parámetros de Simulación", padding="10")
         marco_sim.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=10)
@@ -110,6 +142,28 @@ class InterfazSimulacionProyectiles:
         self.entrada_factor_vel.grid(row=1, column=1, padx=5)
         ttk.Label(marco_sim, text="(1=lento, 5=rápido)", font=("Arial", 8)).grid(row=1, column=2, columnspan=2, sticky=tk.W, padx=5)
         
+        ttk.Label(marco_sim, text="Realizaciones Monte Carlo:").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.entrada_realizaciones = ttk.Entry(marco_sim, width=12)
+        self.entrada_realizaciones.insert(0, "1000")
+        self.entrada_realizaciones.grid(row=2, column=1, padx=5)
+        
+        ttk.Label(marco_sim, text="Radio de colisión (m):").grid(row=2, column=2, sticky=tk.W, padx=5)
+        self.entrada_radio = ttk.Entry(marco_sim, width=12)
+        self.entrada_radio.insert(0, "3.0")
+        self.entrada_radio.grid(row=2, column=3, padx=5)
+        
+        ttk.Label(marco_sim, text="Integrador:").grid(row=3, column=0, sticky=tk.W, padx=5)
+        self.combo_integrador = ttk.Combobox(marco_sim, width=10, state="readonly", values=["euler", "exacto"])
+        self.combo_integrador.current(0)
+        self.combo_integrador.grid(row=3, column=1, padx=5)
+        ttk.Label(marco_sim, text="(exacto: resultado independiente de Δt)", font=("Arial", 8)).grid(row=3, column=2, columnspan=2, sticky=tk.W, padx=5)
+        
+        ttk.Label(marco_sim, text="Guiado de B (Hz):").grid(row=4, column=0, sticky=tk.W, padx=5)
+        self.entrada_guiado = ttk.Entry(marco_sim, width=12)
+        self.entrada_guiado.insert(0, "0")
+        self.entrada_guiado.grid(row=4, column=1, padx=5)
+        ttk.Label(marco_sim, text="(0 = lazo abierto)", font=("Arial", 8)).grid(row=4, column=2, columnspan=2, sticky=tk.W, padx=5)
+        
         # Métodos numéricos
         marco_metodos = ttk.LabelFrame(marco_principal, text="Métodos Numéricos", padding="10")
         marco_metodos.grid(row=3, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=10)
@@ -124,6 +178,23 @@ class InterfazSimulacionProyectiles:
                        value="secant", command=self.actualizar_escenarios)
         radio_secant.grid(row=0, column=1, sticky=tk.W, padx=5)
         
+        radio_brent = ttk.Radiobutton(marco_metodos, text="Brent", variable=self.variable_metodo, 
+                       value="brent", command=self.actualizar_escenarios)
+        radio_brent.grid(row=0, column=2, sticky=tk.W, padx=5)
+        
+        radio_newton = ttk.Radiobutton(marco_metodos, text="Newton", variable=self.variable_metodo, 
+                       value="newton", command=self.actualizar_escenarios)
+        radio_newton.grid(row=0, column=3, sticky=tk.W, padx=5)
+        
+        radio_analitico = ttk.Radiobutton(marco_metodos, text="Analítico", variable=self.variable_metodo, 
+                       value="analitico", command=self.actualizar_escenarios)
+        radio_analitico.grid(row=0, column=4, sticky=tk.W, padx=5)
+        self.variable_metodo.trace_add("write", self.programar_vista_previa)
+        
+        # Vista previa de u(tc), junto a los parámetros
+        self.marco_vista_previa = ttk.LabelFrame(marco_principal, text="Vista previa u(tc)", padding="10")
+        self.marco_vista_previa.grid(row=1, column=4, rowspan=4, sticky=(tk.N, tk.S), padx=10, pady=10)
+        
         # Escenarios
         marco_escenarios = ttk.LabelFrame(marco_principal, text="🎯 Escenarios Predefinidos (Unificados)", padding="10")
         marco_escenarios.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=10)
@@ -161,12 +232,31 @@ class InterfazSimulacionProyectiles:
         
         ttk.Button(marco_botones, text="Calcular Solución", 
                   command=self.calcular_solucion_optima).pack(side=tk.LEFT, padx=5)
+        ttk.Button(marco_botones, text="Solución Robusta", 
+                  command=self.calcular_solucion_robusta).pack(side=tk.LEFT, padx=5)
         ttk.Button(marco_botones, text="Simular Trayectorias", 
                   command=self.iniciar_simulacion_trayectorias).pack(side=tk.LEFT, padx=5)
+        ttk.Button(marco_botones, text="Monte Carlo", 
+                  command=self.ejecutar_monte_carlo).pack(side=tk.LEFT, padx=5)
         ttk.Button(marco_botones, text="Comparar Métodos", 
                   command=self.comparar_metodos_numericos).pack(side=tk.LEFT, padx=5)
         ttk.Button(marco_botones, text="Limpiar", 
                   command=self.limpiar_resultados).pack(side=tk.LEFT, padx=5)
+        self.boton_cancelar = ttk.Button(marco_botones, text="Cancelar", state=tk.DISABLED,
+                                         command=self.cancelar_trabajo)
+        self.boton_cancelar.pack(side=tk.LEFT, padx=5)
+        
+        # Progreso del trabajo en segundo plano
+        marco_progreso = ttk.Frame(marco_principal)
+        marco_progreso.grid(row=7, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        self.barra_progreso = ttk.Progressbar(marco_progreso, length=400, mode="determinate", maximum=1.0)
+        self.barra_progreso.pack(side=tk.LEFT, padx=5)
+        self.etiqueta_estado = ttk.Label(marco_progreso, text="Listo")
+        self.etiqueta_estado.pack(side=tk.LEFT, padx=5)
+        
+        # Gráfico de trayectorias embebido
+        self.marco_grafico = ttk.LabelFrame(marco_principal, text="Trayectorias", padding="10")
+        self.marco_grafico.grid(row=8, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=10)
         
         # Resultados
         marco_resultados = ttk.LabelFrame(marco_principal, text="Resultados", padding="10")
@@ -185,6 +275,7 @@ class InterfazSimulacionProyectiles:
         # Inicializar escenarios
         self.definir_escenarios()
         self.actualizar_escenarios()
+        self.programar_vista_previa()
 
     def definir_escenarios(self):
         """Define una lista UNIFICADA de escenarios para ambos métodos."""
@@ -262,6 +353,7 @@ class InterfazSimulacionProyectiles:
         self.texto_resultados.insert(tk.END, f"✅ {data['desc']} cargado.\n")
         self.texto_resultados.insert(tk.END, f"🔄 Valores unificados para ambos métodos.\n")
         self.texto_resultados.insert(tk.END, f"📊 Parámetros: D={data['D']}, h={data['h']}, v={data['v']}, φ={data['phi']}°, T={data['T']}\n")
+        self.programar_vista_previa()
 
     def cargar_escenario_relacion_3_1(self, a):
         """Genera parámetros que garantizan colisión en x≈3a, y≈a."""
@@ -283,6 +375,7 @@ class InterfazSimulacionProyectiles:
         self.texto_resultados.delete(1.0, tk.END)
         self.texto_resultados.insert(tk.END, f"✅ Relación 3:1 generada con a={a}m\n")
         self.texto_resultados.insert(tk.END, f"📌 Objetivo: Colisión en x≈{3*a:.1f}m, y≈{a:.1f}m\n")
+        self.programar_vista_previa()
 
     def validar_entradas(self):
         """Valida las entradas del usuario."""
@@ -295,6 +388,8 @@ class InterfazSimulacionProyectiles:
             sigma = float(self.entrada_sigma.get())
             dt = float(self.entrada_dt.get())
             factor_vel = float(self.entrada_factor_vel.get())
+            radio = float(self.entrada_radio.get())
+            guiado = float(self.entrada_guiado.get())
             
             if D <= 0: raise ValueError("D debe ser > 0")
             if h < 0: raise ValueError("h no puede ser negativo")
@@ -303,64 +398,261 @@ class InterfazSimulacionProyectiles:
             if T < 0: raise ValueError("T no puede ser negativo")
             if sigma < 0: raise ValueError("σ no puede ser negativo")
             if dt <= 0: raise ValueError("Δt debe ser > 0")
+            if radio <= 0: raise ValueError("El radio de colisión debe ser > 0")
+            if guiado < 0: raise ValueError("La frecuencia de guiado no puede ser negativa")
             
-            return D, h, v, np.radians(phi), T, self.g, sigma, dt, factor_vel
+            return D, h, v, np.radians(phi), T, self.g, sigma, dt, factor_vel, radio, guiado
         except ValueError as e:
             messagebox.showerror("Error de entrada", f"Entrada inválida: {e}")
             return None
 
-    def calcular_solucion_optima(self):
-        """Calcula la solución óptima usando el método seleccionado."""
-        entradas = self.validar_entradas()
-        if entradas is None: return
+    def programar_vista_previa(self, *_):
+        """Agenda la vista previa; cada edición nueva pospone el cálculo (antirrebote)."""
+        if self.vista_previa_pendiente is not None:
+            self.ventana_principal.after_cancel(self.vista_previa_pendiente)
+        self.vista_previa_pendiente = self.ventana_principal.after(300, self.actualizar_vista_previa)
+    
+    def _leer_parametros_previa(self):
+        """Lee D, h, v, φ y T sin mostrar errores; retorna None si aún no son válidos."""
+        try:
+            D, h, v, phi, T = (float(entrada.get()) for entrada in
+                               (self.entrada_D, self.entrada_h, self.entrada_v, self.entrada_phi, self.entrada_T))
+        except ValueError:
+            return None
+        if D <= 0 or h < 0 or v <= 0 or not (0 < phi < 90) or T < 0:
+            return None
+        return D, h, v, np.radians(phi), T, self.g
+    
+    def _preparar_vista_previa(self):
+        """Crea la figura de la vista previa la primera vez; sus líneas se reutilizan siempre."""
+        if self.lienzo_previa is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.figura_previa = Figure(figsize=(4.5, 3.8), layout="tight")
+            ax = self.figura_previa.add_subplot()
+            ax.set_xlabel("tc (s)")
+            ax.set_ylabel("u (m/s)")
+            ax.grid(True, alpha=0.3)
+            self.lineas_previa = {
+                'curva': ax.plot([], [], 'b-', lw=1.5, label='u(tc)')[0],
+                'limite': ax.plot([], [], 'k--', lw=1, label='Límite de u')[0],
+                'infactible': ax.plot([], [], 'r-', lw=6, alpha=0.5, solid_capstyle='butt',
+                                      label='Sin solución válida')[0],
+                'iterados': ax.plot([], [], 'o', color='orange', ms=4, label='Iterados')[0],
+                'optimo': ax.plot([], [], 'g*', ms=12, label='Óptimo')[0],
+            }
+            ax.legend(fontsize=7, loc='upper right')
+            self.lienzo_previa = FigureCanvasTkAgg(self.figura_previa, master=self.marco_vista_previa)
+            self.lienzo_previa.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return self.lineas_previa
+    
+    def actualizar_vista_previa(self):
+        """
+        Redibuja u(tc) en el intervalo de búsqueda con el óptimo y los iterados del método elegido.
+        La malla sólo se recalcula si cambiaron los parámetros y los iterados sólo si cambió algo;
+        las líneas existentes se actualizan con set_data en lugar de volver a graficar.
+        """
+        self.vista_previa_pendiente = None
+        lineas = self._preparar_vista_previa()
+        ax = lineas['curva'].axes
+        parametros = self._leer_parametros_previa()
+        metodo = self.variable_metodo.get()
+        
+        if parametros is None or self.curva_previa is None or self.curva_previa[0] != parametros:
+            self.iterados_previa = None
+            try:
+                if parametros is None:
+                    raise ValueError("Parámetros incompletos o fuera de rango")
+                curva = calculos.curva_velocidad_u(*parametros)
+            except ValueError as e:
+                self.curva_previa = None
+                for linea in lineas.values():
+                    linea.set_data([], [])
+                ax.set_title(str(e), fontsize=8)
+                self.lienzo_previa.draw_idle()
+                return
+            
+            self.curva_previa = (parametros, curva)
+            limite = calculos.LIMITE_VELOCIDAD_U
+            u = np.where(np.isfinite(curva['u']), curva['u'], np.nan)
+            infactible = ~(curva['u'] <= limite)
+            lineas['curva'].set_data(curva['tc'], u)
+            lineas['limite'].set_data([curva['a'], curva['b']], [limite, limite])
+            lineas['infactible'].set_data(curva['tc'], np.where(infactible, 0.0, np.nan))
+            
+            u_max = np.nanmax(u) if np.isfinite(u).any() else limite
+            ax.set_xlim(curva['a'], curva['b'])
+            ax.set_ylim(0, min(u_max, 1.5 * limite) * 1.05)
         
-        D, h, v, phi, T, g, sigma, dt, factor_vel = entradas
-        t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
-        if t_max is None or t_max <= 0:
-            messagebox.showerror("Error", "No se pudo calcular t_max válido.")
+        if self.iterados_previa is not None and self.iterados_previa[0] == metodo:
+            return
+        
+        curva = self.curva_previa[1]
+        iterados = calculos.iterados_metodo(*parametros, curva['a'], curva['b'], metodo)
+        self.iterados_previa = (metodo, iterados)
+        u_iterados = iterados['iterados_u']
+        lineas['iterados'].set_data(iterados['iterados_tc'], np.where(np.isfinite(u_iterados), u_iterados, np.nan))
+        tc_optimo, u_optimo = iterados['tc_optimo'], iterados['u_optimo']
+        lineas['optimo'].set_data([tc_optimo], [u_optimo if np.isfinite(u_optimo) else np.nan])
+        
+        nombre_metodo = calculos.METODOS_NUMERICOS[metodo][0]
+        titulo = f"{nombre_metodo}: tc={tc_optimo:.3f} s, u={u_optimo:.2f} m/s, {iterados['iteraciones']} it. ({iterados['motivo']})"
+        if not u_optimo <= calculos.LIMITE_VELOCIDAD_U:
+            titulo += "\n⚠ u excede el límite"
+        ax.set_title(titulo, fontsize=8)
+        self.lienzo_previa.draw_idle()
+    
+    def ejecutar_en_segundo_plano(self, descripcion, tarea, al_terminar):
+        """
+        Ejecuta tarea(progreso, cancelado) en el hilo de trabajo y entrega su resultado
+        a al_terminar(resultado) en el hilo de Tk. Sólo admite un trabajo a la vez.
+        """
+        if self.trabajo_actual is not None:
+            messagebox.showwarning("Advertencia", "Ya hay un cálculo en curso.")
             return
         
-        margen_inf = 0.1
-        a, b = T + margen_inf, t_max * 0.95
+        self.evento_cancelar.clear()
+        self.progreso_trabajo = 0.0
+        self.barra_progreso['value'] = 0.0
+        self.etiqueta_estado.config(text=descripcion)
+        self.boton_cancelar.config(state=tk.NORMAL)
         
-        if b <= a:
-            messagebox.showerror("Error", f"Intervalo inválido: T={T:.2f} es muy cercano a t_max={t_max:.2f}")
+        def progreso(fraccion):
+            self.progreso_trabajo = fraccion
+        
+        self.trabajo_actual = self.ejecutor.submit(tarea, progreso, self.evento_cancelar)
+        self.ventana_principal.after(50, self._revisar_trabajo, descripcion, al_terminar)
+
+    def _revisar_trabajo(self, descripcion, al_terminar):
+        """Sondea el trabajo en curso y actualiza la barra de progreso."""
+        trabajo = self.trabajo_actual
+        self.barra_progreso['value'] = self.progreso_trabajo
+        if not trabajo.done():
+            self.ventana_principal.after(50, self._revisar_trabajo, descripcion, al_terminar)
             return
         
-        args = (D, h, v, phi, T, g)
-        metodo_seleccionado = self.variable_metodo.get()
-        tiempo_inicio = time.time()
+        self.trabajo_actual = None
+        self.boton_cancelar.config(state=tk.DISABLED)
+        if self.evento_cancelar.is_set():
+            self.etiqueta_estado.config(text="Cancelado")
+            self.texto_resultados.insert(tk.END, f"⛔ {descripcion} cancelado.\n")
+            return
         
         try:
-            if metodo_seleccionado == "golden":
-                nombre_metodo = "Sección Dorada"
-                tc_optimo, iteraciones = calculos.minimizacion_seccion_dorada(calculos.funcion_velocidad_u, a, b, args)
-            else:
-                nombre_metodo = "Secante"
-                tc_optimo, iteraciones = calculos.minimizacion_metodo_secante(calculos.funcion_velocidad_u, a, b, args)
+            resultado = trabajo.result()
+        except ValueError as e:
+            self.etiqueta_estado.config(text="Error")
+            messagebox.showerror("Error", str(e))
+            return
         except Exception as e:
-            messagebox.showerror("Error", f"Error en optimización: {e}")
+            self.etiqueta_estado.config(text="Error")
+            messagebox.showerror("Error", f"Error en {descripcion.lower()}: {e}")
             return
         
-        tiempo_calculo = time.time() - tiempo_inicio
-        
-        if not np.isfinite(tc_optimo) or tc_optimo <= T:
-            messagebox.showerror("Error", "No se encontró tc válido.")
-            return
+        self.barra_progreso['value'] = 1.0
+        self.etiqueta_estado.config(text="Listo")
+        al_terminar(resultado)
+
+    def cancelar_trabajo(self):
+        """Pide al trabajo en curso que se detenga en su próximo punto de control."""
+        if self.trabajo_actual is not None:
+            self.evento_cancelar.set()
+            self.etiqueta_estado.config(text="Cancelando...")
+
+    def cerrar_ventana(self):
+        """Cancela el trabajo en curso y cierra la aplicación sin esperar al hilo."""
+        self.evento_cancelar.set()
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
+        self.detener_animacion()
+        if self.vista_previa_pendiente is not None:
+            self.ventana_principal.after_cancel(self.vista_previa_pendiente)
+        try:
+            self.cache_soluciones.persistir()
+        except OSError as e:
+            print(f"No se pudo guardar la caché de soluciones: {e}")
+        self.ventana_principal.destroy()
+
+    def calcular_solucion_optima(self):
+        """Calcula la solución óptima usando el método seleccionado."""
+        entradas = self.validar_entradas()
+        if entradas is None: return
         
-        u_optimo = calculos.funcion_velocidad_u(tc_optimo, D, h, v, phi, T, g)
-        theta_optimo = calculos.funcion_angulo_theta(tc_optimo, D, h, v, phi, T, g)
-        limite_u = 450 
+        D, h, v, phi, T, g, sigma, dt, factor_vel, radio, guiado = entradas
+        metodo_seleccionado = self.variable_metodo.get()
         
-        if not np.isfinite(u_optimo) or u_optimo > limite_u:
-            messagebox.showerror("Error", f"Velocidad u excesiva ({u_optimo:.1f} m/s).")
+        def tarea(progreso, cancelado):
+            tiempo_inicio = time.time()
+            solucion = calculos.resolver_intercepcion(D, h, v, phi, T, g, metodo_seleccionado,
+                                                      cache=self.cache_soluciones)
+            if cancelado.is_set():
+                return None
+            return solucion, time.time() - tiempo_inicio
+        
+        def al_terminar(resultado):
+            solucion, tiempo_calculo = resultado
+            solucion.update({
+                'sigma': sigma, 'dt': dt, 'factor_velocidad': factor_vel,
+                'radio_colision': radio, 'integrador': self.combo_integrador.get(),
+                'frecuencia_guiado': guiado
+            })
+            self.mostrar_solucion_optima(solucion, tiempo_calculo)
+        
+        self.ejecutar_en_segundo_plano("Cálculo de la solución", tarea, al_terminar)
+
+    def calcular_solucion_robusta(self):
+        """Busca el lanzamiento de mayor probabilidad de impacto con el ruido indicado."""
+        entradas = self.validar_entradas()
+        if entradas is None: return
+        try:
+            n_realizaciones = int(self.entrada_realizaciones.get())
+            if n_realizaciones <= 0: raise ValueError("debe ser > 0")
+        except ValueError as e:
+            messagebox.showerror("Error de entrada", f"Número de realizaciones inválido: {e}")
             return
         
-        x_col, y_col = calculos.posicion_proyectil_A(tc_optimo, D, h, v, phi, g)
+        D, h, v, phi, T, g, sigma, dt, factor_vel, radio, guiado = entradas
+        metodo_seleccionado = self.variable_metodo.get()
+        integrador = self.combo_integrador.get()
+        
+        def tarea(progreso, cancelado):
+            tiempo_inicio = time.time()
+            solucion = calculos.resolver_intercepcion(D, h, v, phi, T, g, metodo_seleccionado,
+                                                      cache=self.cache_soluciones)
+            solucion.update({
+                'sigma': sigma, 'dt': dt, 'factor_velocidad': factor_vel,
+                'radio_colision': radio, 'integrador': integrador,
+                'frecuencia_guiado': guiado
+            })
+            if cancelado.is_set():
+                return None
+            progreso(0.2)
+            solucion = simulacion.resolver_intercepcion_robusta(
+                solucion, n_realizaciones, progreso=lambda fraccion: progreso(0.2 + 0.8 * fraccion),
+                cancelado=cancelado.is_set)
+            if solucion is None:
+                return None
+            return solucion, time.time() - tiempo_inicio
+        
+        def al_terminar(resultado):
+            solucion, tiempo_calculo = resultado
+            self.mostrar_solucion_optima(solucion, tiempo_calculo)
+            self.texto_resultados.insert(tk.END, f"\n🎯 Probabilidad de impacto estimada ({solucion['n_realizaciones']} realizaciones):\n")
+            self.texto_resultados.insert(tk.END, f"  Con u mínima: {100 * solucion['probabilidad_impacto_nominal']:.1f} %\n")
+            self.texto_resultados.insert(tk.END, f"  Robusta:      {100 * solucion['probabilidad_impacto']:.1f} %\n")
+        
+        self.ejecutar_en_segundo_plano("Solución robusta", tarea, al_terminar)
+
+    def mostrar_solucion_optima(self, solucion, tiempo_calculo):
+        """Muestra la solución óptima y la guarda para la simulación."""
+        nombre_metodo, iteraciones = solucion['metodo'], solucion['iteraciones']
+        tc_optimo, u_optimo, theta_optimo = solucion['tc'], solucion['u'], solucion['theta']
+        x_col, y_col = solucion['x_col'], solucion['y_col']
         
         self.texto_resultados.delete(1.0, tk.END)
         self.texto_resultados.insert(tk.END, f"=== SOLUCIÓN ÓPTIMA ===\n")
         self.texto_resultados.insert(tk.END, f"Método: {nombre_metodo}\n")
+        if solucion.get('desde_cache'):
+            self.texto_resultados.insert(tk.END, f"♻️  Solución recuperada de la caché\n")
         self.texto_resultados.insert(tk.END, f"Tiempo de cálculo: {tiempo_calculo:.6f} s\n")
         self.texto_resultados.insert(tk.END, f"Iteraciones: {iteraciones}\n\n")
         self.texto_resultados.insert(tk.END, f"Tiempo de colisión (tc): {tc_optimo:.6f} s\n")
@@ -371,20 +663,12 @@ class InterfazSimulacionProyectiles:
         self.texto_resultados.insert(tk.END, f"  y = {y_col:.6f} m\n")
         
         if "Relación 3:1" in self.combo_escenarios.get():
-            try:
-                a_val = float(self.entrada_a.get())
-                ratio = x_col / y_col if y_col != 0 else float('inf')
-                self.texto_resultados.insert(tk.END, f"\n📊 Relación x/y: {ratio:.3f} (Objetivo: ~3.0)\n")
-            except: pass
+            ratio = x_col / y_col if y_col != 0 else float('inf')
+            self.texto_resultados.insert(tk.END, f"\n📊 Relación x/y: {ratio:.3f} (Objetivo: ~3.0)\n")
         
         self.texto_resultados.insert(tk.END, f"\n📍 Altura de impacto: {y_col:.2f} m\n")
         
-        self.solucion_calculada = {
-            'D': D, 'h': h, 'v': v, 'phi': phi, 'T': T,
-            'u': u_optimo, 'theta': theta_optimo, 'tc': tc_optimo,
-            'sigma': sigma, 'dt': dt, 'g': g,
-            'factor_velocidad': factor_vel
-        }
+        self.solucion_calculada = solucion
 
     def iniciar_simulacion_trayectorias(self):
         """Inicia la simulación con animación."""
@@ -392,14 +676,101 @@ class InterfazSimulacionProyectiles:
             messagebox.showwarning("Advertencia", "Primero calcule la solución óptima.")
             return
         
-        simulacion.simular_y_animar_trayectorias(self.solucion_calculada)
+        self.detener_animacion()
+        solucion = dict(self.solucion_calculada)
+        
+        def tarea(progreso, cancelado):
+            return simulacion.simular_trayectorias(solucion)
+        
+        def al_terminar(resultado):
+            self.mostrar_animacion(resultado, solucion)
+        
+        self.ejecutar_en_segundo_plano("Simulación de trayectorias", tarea, al_terminar)
+    
+    def _preparar_lienzo(self):
+        """Crea la figura embebida la primera vez; después se reutiliza con sus artistas."""
+        if self.lienzo is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            # Figure directa, sin pyplot: no queda registrada en ninguna lista global
+            self.figura = Figure(figsize=(9, 5.5), layout="tight")
+            self.vista_trayectorias = simulacion.VistaTrayectorias(self.figura.add_subplot())
+            self.lienzo = FigureCanvasTkAgg(self.figura, master=self.marco_grafico)
+            self.lienzo.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return self.vista_trayectorias
+    
+    def mostrar_animacion(self, resultado, solucion):
+        """Anima una simulación en el lienzo embebido, reutilizando la figura y sus artistas."""
+        from matplotlib.animation import FuncAnimation
+        
+        self.detener_animacion()
+        vista = self._preparar_lienzo()
+        vista.cargar(resultado, solucion)
+        self.animacion = FuncAnimation(self.figura, vista.cuadro, init_func=vista.inicio,
+                                       frames=vista.n_cuadros, interval=vista.intervalo,
+                                       blit=True, repeat=False)
+        self.lienzo.draw_idle()
+        simulacion.imprimir_resumen_simulacion(resultado)
+    
+    def detener_animacion(self):
+        """Detiene la animación en curso y suelta su temporizador y sus callbacks."""
+        if self.animacion is not None:
+            self.animacion.pause()
+            self.animacion = None
+    
+    def ejecutar_monte_carlo(self):
+        """Estima la probabilidad de impacto con muchas realizaciones del ruido."""
+        if not self.solucion_calculada:
+            messagebox.showwarning("Advertencia", "Primero calcule la solución óptima.")
+            return
+        try:
+            n_realizaciones = int(self.entrada_realizaciones.get())
+            if n_realizaciones <= 0: raise ValueError("debe ser > 0")
+        except ValueError as e:
+            messagebox.showerror("Error de entrada", f"Número de realizaciones inválido: {e}")
+            return
+        
+        solucion = dict(self.solucion_calculada)
+        
+        def tarea(progreso, cancelado):
+            # Por lotes, para informar el avance y poder cancelar entre uno y otro
+            tiempo_inicio = time.time()
+            tamano_lote = max(1, n_realizaciones // 20)
+            lotes = []
+            hechas = 0
+            while hechas < n_realizaciones:
+                if cancelado.is_set():
+                    return None
+                n_lote = min(tamano_lote, n_realizaciones - hechas)
+                lotes.append(simulacion.simular_monte_carlo(solucion, n_lote))
+                hechas += n_lote
+                progreso(hechas / n_realizaciones)
+            return simulacion.combinar_resultados_monte_carlo(lotes), time.time() - tiempo_inicio
+        
+        def al_terminar(resultado):
+            res, tiempo_calculo = resultado
+            impacto = res['impacto']
+            self.texto_resultados.delete(1.0, tk.END)
+            self.texto_resultados.insert(tk.END, f"=== MONTE CARLO (σ={solucion['sigma']}) ===\n")
+            self.texto_resultados.insert(tk.END, f"Realizaciones: {res['n_realizaciones']}\n")
+            self.texto_resultados.insert(tk.END, f"Tiempo de cálculo: {tiempo_calculo:.4f} s\n\n")
+            self.texto_resultados.insert(tk.END, f"Tasa de impacto: {100 * res['tasa_impacto']:.2f} %\n")
+            if impacto.any():
+                tiempos = res['tiempos_colision'][impacto]
+                errores = res['errores_posicion'][impacto]
+                self.texto_resultados.insert(tk.END, f"Tiempo de colisión: media {tiempos.mean():.3f} s, desv. {tiempos.std():.3f} s\n")
+                self.texto_resultados.insert(tk.END, f"Error de posición: media {errores.mean():.3f} m, p95 {np.percentile(errores, 95):.3f} m\n")
+            distancias = res['distancia_minima']
+            self.texto_resultados.insert(tk.END, f"Distancia mínima: media {distancias.mean():.3f} m, p95 {np.percentile(distancias, 95):.3f} m\n")
+        
+        self.ejecutar_en_segundo_plano("Monte Carlo", tarea, al_terminar)
     
     def comparar_metodos_numericos(self):
-        """Compara ambos métodos numéricos."""
+        """Compara los métodos numéricos disponibles."""
         entradas = self.validar_entradas()
         if entradas is None: return
         
-        D, h, v, phi, T, g, sigma, dt, factor_vel = entradas
+        D, h, v, phi, T, g = entradas[:6]
         t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
         if t_max is None or t_max <= 0:
             messagebox.showerror("Error", "No se pudo calcular t_max.")
@@ -411,41 +782,57 @@ class InterfazSimulacionProyectiles:
             return
         
         args = (D, h, v, phi, T, g)
-        metodos = [("Sección Dorada", calculos.minimizacion_seccion_dorada), ("Secante", calculos.minimizacion_metodo_secante)]
-        resultados = []
+        metodos = list(calculos.METODOS_NUMERICOS.values())
         
         self.texto_resultados.delete(1.0, tk.END)
         self.texto_resultados.insert(tk.END, "Calculando comparación...\n")
-        self.ventana_principal.update()
         
-        for nombre_metodo, funcion_metodo in metodos:
-            tiempo_inicio = time.time()
-            try:
-                tc_optimo, iteraciones = funcion_metodo(calculos.funcion_velocidad_u, a, b, args)
-                tiempo_calculo = time.time() - tiempo_inicio
-                u_optimo = calculos.funcion_velocidad_u(tc_optimo, D, h, v, phi, T, g)
-                theta_optimo = calculos.funcion_angulo_theta(tc_optimo, D, h, v, phi, T, g)
-                x_col, y_col = calculos.posicion_proyectil_A(tc_optimo, D, h, v, phi, g)
-                
-                resultados.append({
-                    'nombre': nombre_metodo, 'tc': tc_optimo, 'u': u_optimo, 'theta': theta_optimo,
-                    'tiempo': tiempo_calculo, 'y_col': y_col, 'iteraciones': iteraciones,
-                    'valido': np.isfinite(u_optimo) and u_optimo <= 450
-                })
-            except Exception as e:
-                self.texto_resultados.insert(tk.END, f"Error en {nombre_metodo}: {e}\n")
-        
-        self.texto_resultados.delete(1.0, tk.END)
-        self.texto_resultados.insert(tk.END, "=== COMPARACIÓN DE MÉTODOS ===\n\n")
-        
-        for res in resultados:
-            self.texto_resultados.insert(tk.END, f"{res['nombre']}:\n")
-            self.texto_resultados.insert(tk.END, f"  Tiempo: {res['tiempo']:.8f} s\n")
-            self.texto_resultados.insert(tk.END, f"  Iteraciones: {res['iteraciones']}\n")
-            self.texto_resultados.insert(tk.END, f"  tc: {res['tc']:.8f} s\n")
-            self.texto_resultados.insert(tk.END, f"  u: {res['u']:.8f} m/s\n")
-            self.texto_resultados.insert(tk.END, f"  θ: {np.degrees(res['theta']):.8f}°\n")
-            self.texto_resultados.insert(tk.END, f"  ✅ VÁLIDO\n\n" if res['valido'] else f"  ⚠️  DIVERGENTE\n\n")
+        def tarea(progreso, cancelado):
+            resultados, errores = [], []
+            for k, (nombre_metodo, funcion_metodo) in enumerate(metodos):
+                if cancelado.is_set():
+                    return None
+                tiempo_inicio = time.time()
+                try:
+                    resultado_min = funcion_metodo(calculos.funcion_velocidad_u, a, b, args)
+                    tiempo_calculo = time.time() - tiempo_inicio
+                    tc_optimo, iteraciones = resultado_min
+                    u_optimo = calculos.funcion_velocidad_u(tc_optimo, D, h, v, phi, T, g)
+                    theta_optimo = calculos.funcion_angulo_theta(tc_optimo, D, h, v, phi, T, g)
+                    y_col = calculos.posicion_proyectil_A(tc_optimo, D, h, v, phi, g)[1]
+                    
+                    resultados.append({
+                        'nombre': nombre_metodo, 'tc': tc_optimo, 'u': u_optimo, 'theta': theta_optimo,
+                        'tiempo': tiempo_calculo, 'y_col': y_col, 'iteraciones': iteraciones,
+                        'evaluaciones': resultado_min.evaluaciones,
+                        'evaluaciones_infinitas': resultado_min.evaluaciones_infinitas,
+                        'motivo': resultado_min.motivo,
+                        'valido': np.isfinite(u_optimo) and u_optimo <= calculos.LIMITE_VELOCIDAD_U
+                    })
+                except Exception as e:
+                    errores.append(f"Error en {nombre_metodo}: {e}\n")
+                progreso((k + 1) / len(metodos))
+            return resultados, errores
+        
+        def al_terminar(resultado):
+            resultados, errores = resultado
+            self.texto_resultados.delete(1.0, tk.END)
+            self.texto_resultados.insert(tk.END, "=== COMPARACIÓN DE MÉTODOS ===\n\n")
+            for error in errores:
+                self.texto_resultados.insert(tk.END, error)
+            
+            for res in resultados:
+                self.texto_resultados.insert(tk.END, f"{res['nombre']}:\n")
+                self.texto_resultados.insert(tk.END, f"  Tiempo: {res['tiempo']:.8f} s\n")
+                self.texto_resultados.insert(tk.END, f"  Iteraciones: {res['iteraciones']}\n")
+                self.texto_resultados.insert(tk.END, f"  Evaluaciones de u: {res['evaluaciones']} ({res['evaluaciones_infinitas']} inf)\n")
+                self.texto_resultados.insert(tk.END, f"  Terminación: {res['motivo']}\n")
+                self.texto_resultados.insert(tk.END, f"  tc: {res['tc']:.8f} s\n")
+                self.texto_resultados.insert(tk.END, f"  u: {res['u']:.8f} m/s\n")
+                self.texto_resultados.insert(tk.END, f"  θ: {np.degrees(res['theta']):.8f}°\n")
+                self.texto_resultados.insert(tk.END, f"  ✅ VÁLIDO\n\n" if res['valido'] else f"  ⚠️  DIVERGENTE\n\n")
+        
+        self.ejecutar_en_segundo_plano("Comparación de métodos", tarea, al_terminar)
 
     def limpiar_resultados(self):
         """Limpia el área de resultados."""
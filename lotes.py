@@ -0,0 +1,181 @@
+import csv
+import itertools
+import json
+import sys
+import numpy as np
+import calculos
+
+COLUMNAS_ENTRADA = ("D", "h", "v", "phi", "T", "sigma", "dt")
+VALORES_POR_DEFECTO = {"sigma": 0.2, "dt": 0.05}
+COLUMNAS_SALIDA = ("fila", "D", "h", "v", "phi", "T", "sigma", "dt", "valido",
+                   "tc", "u", "theta", "x_col", "y_col", "error")
+COLUMNAS_SIMULACION = ("colision", "distancia_minima", "tiempo_colision")
+
+# Métodos con versión vectorizada en calculos.resolver_lote
+METODOS_LOTE = calculos.METODOS_LOTE
+
+def _formato(ruta, formato):
+    """Deduce 'csv' o 'jsonl' de la extensión si no se indica."""
+    if formato:
+        return formato
+    return "jsonl" if ruta.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+def _abrir(ruta, modo):
+    """Abre un archivo o la entrada/salida estándar si la ruta es '-'."""
+    if ruta == "-":
+        return sys.stdin if "r" in modo else sys.stdout
+    return open(ruta, modo, encoding="utf-8", newline="")
+
+def leer_escenarios(archivo, formato):
+    """
+    Genera los registros fila a fila, sin cargar el archivo completo: diccionarios en CSV y
+    líneas sin decodificar en JSON Lines (se decodifican en procesar_bloque, fila por fila).
+    """
+    if formato == "csv":
+        yield from csv.DictReader(archivo)
+    else:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea:
+                yield linea
+
+def _decodificar(registro):
+    """Convierte una línea JSON en diccionario; lanza ValueError o TypeError si no es un objeto."""
+    if isinstance(registro, str):
+        registro = json.loads(registro)
+    if not isinstance(registro, dict):
+        raise TypeError("el registro no es un objeto JSON")
+    return registro
+
+# Mismos rangos que valida la interfaz; las comparaciones negadas rechazan también NaN
+RANGOS_ENTRADA = (
+    ("D", lambda x: x > 0, "D debe ser > 0"),
+    ("h", lambda x: x >= 0, "h no puede ser negativo"),
+    ("v", lambda x: x > 0, "v debe ser > 0"),
+    ("phi", lambda x: 0 < x < 90, "φ debe estar entre 0 y 90 grados"),
+    ("T", lambda x: x >= 0, "T no puede ser negativo"),
+    ("sigma", lambda x: x >= 0, "σ no puede ser negativo"),
+    ("dt", lambda x: x > 0, "Δt debe ser > 0"),
+)
+
+def _convertir(registro):
+    """
+    Convierte un registro en valores numéricos (phi en grados) y verifica sus rangos;
+    lanza ValueError si falta algo o si un valor está fuera de rango.
+    """
+    valores = {}
+    for columna in COLUMNAS_ENTRADA:
+        valor = registro.get(columna)
+        if valor in (None, ""):
+            if columna not in VALORES_POR_DEFECTO:
+                raise ValueError(f"falta la columna {columna}")
+            valor = VALORES_POR_DEFECTO[columna]
+        valores[columna] = float(valor)
+    for columna, valido, mensaje in RANGOS_ENTRADA:
+        if not valido(valores[columna]):
+            raise ValueError(mensaje)
+    return valores
+
+def procesar_bloque(registros, primera_fila, metodo, g=9.81):
+    """Resuelve un bloque de registros y retorna las filas de salida en el mismo orden."""
+    filas, validos = [], []
+    for k, registro in enumerate(registros):
+        fila = {"fila": primera_fila + k, "valido": False, "error": ""}
+        try:
+            registro = _decodificar(registro)
+            fila.update(_convertir(registro))
+            validos.append(k)
+        except (TypeError, ValueError) as e:
+            fila["error"] = f"Entrada inválida: {e}"
+            # Se conservan los valores leídos para poder ubicar la fila con problemas
+            if isinstance(registro, dict):
+                fila.update({c: registro[c] for c in COLUMNAS_ENTRADA if c in registro})
+        filas.append(fila)
+    if not validos:
+        return filas
+
+    if metodo in METODOS_LOTE:
+        D, h, v, phi, T = (np.array([filas[k][c] for k in validos]) for c in ("D", "h", "v", "phi", "T"))
+        phi = np.radians(phi)
+        tc, u, theta = calculos.resolver_lote(D, h, v, phi, T, g, metodo=metodo)
+        x_col, y_col = calculos.posicion_proyectil_A(tc, D, h, v, phi, g)
+        for j, k in enumerate(validos):
+            if not np.isfinite(tc[j]):
+                filas[k]["error"] = "Intervalo inválido: T muy cercano a t_max"
+            elif not np.isfinite(u[j]) or u[j] > calculos.LIMITE_VELOCIDAD_U:
+                filas[k]["error"] = f"Velocidad u excesiva ({u[j]:.1f} m/s)."
+            else:
+                filas[k].update(valido=True, tc=float(tc[j]), u=float(u[j]), theta=float(theta[j]),
+                                x_col=float(x_col[j]), y_col=float(y_col[j]))
+    else:
+        for k in validos:
+            fila = filas[k]
+            try:
+                solucion = calculos.resolver_intercepcion(fila["D"], fila["h"], fila["v"], np.radians(fila["phi"]),
+                                                          fila["T"], g, metodo)
+            except ValueError as e:
+                fila["error"] = str(e)
+                continue
+            fila.update(valido=True, **{c: float(solucion[c]) for c in ("tc", "u", "theta", "x_col", "y_col")})
+    return filas
+
+def simular_filas(filas, g=9.81, integrador="euler", semilla=None):
+    """Agrega a cada fila válida el resultado de una simulación con ruido."""
+    import simulacion
+    for fila in filas:
+        if not fila["valido"]:
+            continue
+        solucion = {c: fila[c] for c in ("D", "h", "v", "T", "tc", "u", "theta", "sigma", "dt")}
+        solucion.update(phi=np.radians(fila["phi"]), g=g, integrador=integrador)
+        semilla_fila = None if semilla is None else semilla + fila["fila"]
+        try:
+            resultado = simulacion.simular_trayectorias(solucion, semilla=semilla_fila)
+        except ValueError as e:
+            fila["error"] = f"Simulación fallida: {e}"
+            continue
+        fila["colision"] = bool(resultado["colision_detectada"])
+        fila["distancia_minima"] = resultado["distancia_minima"]
+        fila["tiempo_colision"] = resultado["tiempo_aproximacion_minima"]
+
+def procesar_archivo(entrada, salida, metodo="golden", tamano_bloque=10_000, formato_entrada=None,
+                     formato_salida=None, simular=False, integrador="euler", semilla=None, g=9.81):
+    """
+    Lee escenarios de CSV o JSON Lines en flujo, los resuelve por bloques y escribe cada bloque
+    apenas está listo. La memoria depende del tamaño de bloque, no del tamaño del archivo.
+    Retorna (filas procesadas, filas válidas).
+    """
+    formato_entrada = _formato(entrada, formato_entrada)
+    formato_salida = _formato(salida, formato_salida)
+    columnas = COLUMNAS_SALIDA + (COLUMNAS_SIMULACION if simular else ())
+    total, total_validos = 0, 0
+
+    archivo_entrada = _abrir(entrada, "r")
+    archivo_salida = _abrir(salida, "w")
+    try:
+        escritor = None
+        if formato_salida == "csv":
+            escritor = csv.DictWriter(archivo_salida, fieldnames=columnas, extrasaction="ignore")
+            escritor.writeheader()
+
+        registros = leer_escenarios(archivo_entrada, formato_entrada)
+        while True:
+            bloque = list(itertools.islice(registros, tamano_bloque))
+            if not bloque:
+                break
+            filas = procesar_bloque(bloque, total, metodo, g)
+            if simular:
+                simular_filas(filas, g, integrador, semilla)
+            for fila in filas:
+                if escritor is not None:
+                    escritor.writerow(fila)
+                else:
+                    archivo_salida.write(json.dumps({c: fila.get(c) for c in columnas}) + "\n")
+            archivo_salida.flush()
+            total += len(filas)
+            total_validos += sum(fila["valido"] for fila in filas)
+    finally:
+        if archivo_entrada is not sys.stdin:
+            archivo_entrada.close()
+        if archivo_salida is not sys.stdout:
+            archivo_salida.close()
+    return total, total_validos
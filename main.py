@@ -1,15 +1,150 @@
-import tkinter as tk
-from interfaz import InterfazSimulacionProyectiles
+import argparse
+import sys
 
-def main():
-    """Función principal de la aplicación."""
+def main(ruta_cache=None):
+    """Función principal de la aplicación; ruta_cache activa la caché de soluciones en disco."""
+    import tkinter as tk
+    from tkinter import messagebox
+    from interfaz import InterfazSimulacionProyectiles
+    
     try:
         ventana_principal = tk.Tk()
-        app = InterfazSimulacionProyectiles(ventana_principal)
+        app = InterfazSimulacionProyectiles(ventana_principal, ruta_cache)
         ventana_principal.mainloop()
         
     except Exception as e:
-        tk.messagebox.showerror("Error Fatal", f"No se pudo iniciar la aplicación:\n{e}")
+        messagebox.showerror("Error Fatal", f"No se pudo iniciar la aplicación:\n{e}")
+
+def crear_parser():
+    """Argumentos de línea de comandos para el modo sin interfaz."""
+    import calculos
+    
+    parser = argparse.ArgumentParser(description="Simulación de Colisión de Proyectiles")
+    parser.add_argument("--sin-interfaz", action="store_true",
+                        help="Resuelve y simula el escenario sin abrir la interfaz gráfica")
+    parser.add_argument("--D", type=float, default=120.0, help="Distancia horizontal de A (m)")
+    parser.add_argument("--h", type=float, default=20.0, help="Altura inicial de A (m)")
+    parser.add_argument("--v", type=float, default=25.0, help="Velocidad de A (m/s)")
+    parser.add_argument("--phi", type=float, default=45.0, help="Ángulo de A (grados)")
+    parser.add_argument("--T", type=float, default=2.0, help="Retardo de lanzamiento de B (s)")
+    parser.add_argument("--g", type=float, default=9.81, help="Gravedad (m/s²)")
+    parser.add_argument("--sigma", type=float, default=0.2, help="Intensidad del ruido σ")
+    parser.add_argument("--dt", type=float, default=0.05, help="Paso de tiempo Δt (s)")
+    parser.add_argument("--radio", type=float, default=3.0, help="Radio de colisión (m)")
+    parser.add_argument("--integrador", choices=["euler", "exacto"], default="euler",
+                        help="Integrador de la simulación con ruido")
+    parser.add_argument("--viento", choices=["blanco", "ou", "constante"], default="blanco",
+                        help="Modelo de viento: ruido blanco, ráfagas Ornstein-Uhlenbeck o viento medio constante")
+    parser.add_argument("--tau", type=float, default=1.0, help="Tiempo de correlación de las ráfagas 'ou' (s)")
+    parser.add_argument("--viento-medio", type=float, nargs=2, default=(0.0, 0.0), metavar=("AX", "AY"),
+                        help="Aceleración del viento 'constante' (m/s²)")
+    parser.add_argument("--arrastre", type=float, nargs="+", default=None, metavar="K",
+                        help="Arrastre cuadrático k (1/m) de A y opcionalmente de B; resuelve por disparo")
+    parser.add_argument("--guiado", type=float, default=0.0, metavar="HZ",
+                        help="Frecuencia del guiado en lazo cerrado de B (0 = lazo abierto)")
+    parser.add_argument("--correccion-max", type=float, default=5.0,
+                        help="Corrección máxima de velocidad de B en cada paso de guiado (m/s)")
+    parser.add_argument("--precision", choices=["float64", "float32"], default="float64",
+                        help="Precisión con que se guardan las trayectorias simuladas")
+    parser.add_argument("--exportar", default=None, metavar="ARCHIVO.npz",
+                        help="En modo sin interfaz, guardar las trayectorias en un .npz comprimido")
+    parser.add_argument("--metodo", choices=list(calculos.METODOS_NUMERICOS), default="golden",
+                        help="Método numérico")
+    parser.add_argument("--cache", default=None,
+                        help="Archivo JSON donde guardar y reutilizar soluciones ya calculadas")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla del generador de ruido")
+    parser.add_argument("--monte-carlo", type=int, default=0, metavar="N",
+                        help="En modo sin interfaz, estimar la tasa de impacto con N realizaciones")
+    parser.add_argument("--robusto", type=int, default=0, metavar="N",
+                        help="Elegir u y θ que maximizan la probabilidad de impacto, estimada con N realizaciones")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para Monte Carlo (por defecto, todos los núcleos)")
+    
+    lote = parser.add_argument_group("modo por lotes")
+    lote.add_argument("--lote", metavar="ENTRADA", default=None,
+                      help="Archivo CSV o JSON Lines con columnas D, h, v, phi, T, sigma, dt ('-' = stdin)")
+    lote.add_argument("--salida", default="-", help="Archivo de resultados CSV o JSON Lines ('-' = stdout)")
+    lote.add_argument("--bloque", type=int, default=10000, help="Filas procesadas por bloque")
+    lote.add_argument("--formato-entrada", choices=["csv", "jsonl"], default=None,
+                      help="Formato de la entrada (por defecto, según la extensión)")
+    lote.add_argument("--formato-salida", choices=["csv", "jsonl"], default=None,
+                      help="Formato de la salida (por defecto, según la extensión)")
+    lote.add_argument("--simular", action="store_true",
+                      help="Simular además cada escenario con su σ y Δt")
+    return parser
+
+def main_sin_interfaz(args):
+    """Resuelve y simula un escenario sin importar Tk ni matplotlib."""
+    import numpy as np
+    import calculos
+    import simulacion
+    
+    cache = calculos.CacheSoluciones(ruta=args.cache) if args.cache else None
+    try:
+        if args.arrastre:
+            import arrastre
+            k_A = args.arrastre[0]
+            k_B = args.arrastre[1] if len(args.arrastre) > 1 else k_A
+            solucion = arrastre.resolver_intercepcion_arrastre(args.D, args.h, args.v, np.radians(args.phi),
+                                                               args.T, args.g, k_A, k_B)
+        else:
+            solucion = calculos.resolver_intercepcion(args.D, args.h, args.v, np.radians(args.phi),
+                                                      args.T, args.g, args.metodo, cache=cache)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if cache is not None:
+        cache.persistir()
+    
+    solucion.update({'sigma': args.sigma, 'dt': args.dt, 'radio_colision': args.radio,
+                     'integrador': args.integrador, 'precision': args.precision,
+                     'frecuencia_guiado': args.guiado, 'correccion_maxima': args.correccion_max,
+                     'modelo_ruido': simulacion.crear_modelo_ruido(args.viento, args.sigma, args.tau,
+                                                                   args.viento_medio)})
+    if args.robusto > 0:
+        # Flujo aleatorio propio, distinto del que usa la simulación de verificación
+        semilla_robusta = np.random.SeedSequence(args.semilla).spawn(1)[0]
+        try:
+            solucion = simulacion.resolver_intercepcion_robusta(solucion, args.robusto, semilla_robusta)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Probabilidad de impacto estimada: {100 * solucion['probabilidad_impacto_nominal']:.1f} % "
+              f"(u mínima) -> {100 * solucion['probabilidad_impacto']:.1f} % (robusta)")
+    print(f"Método: {solucion['metodo']} ({solucion['iteraciones']} iteraciones)")
+    print(f"tc = {solucion['tc']:.6f} s, u = {solucion['u']:.6f} m/s, θ = {np.degrees(solucion['theta']):.6f}°")
+    
+    if args.monte_carlo > 0:
+        res = simulacion.simular_monte_carlo_paralelo(solucion, args.monte_carlo, args.semilla, args.procesos)
+        print(f"Monte Carlo: {res['n_realizaciones']} realizaciones, tasa de impacto {100 * res['tasa_impacto']:.2f} %")
+        print(f"Distancia mínima media: {np.mean(res['distancia_minima']):.3f} m")
+        return 0
+    
+    resultado = simulacion.simular_trayectorias(solucion, semilla=args.semilla)
+    simulacion.imprimir_resumen_simulacion(resultado)
+    if args.exportar:
+        simulacion.exportar_trayectorias_npz(args.exportar, resultado)
+        print(f"Trayectorias guardadas en {args.exportar}")
+    return 0 if resultado['colision_detectada'] else 2
+
+def main_lote(args):
+    """Procesa un archivo de escenarios por bloques, sin interfaz gráfica."""
+    import lotes
+    
+    try:
+        total, validos = lotes.procesar_archivo(
+            args.lote, args.salida, args.metodo, args.bloque, args.formato_entrada,
+            args.formato_salida, args.simular, args.integrador, args.semilla, args.g)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{total} escenarios procesados, {validos} con solución válida.", file=sys.stderr)
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    argumentos = crear_parser().parse_args()
+    if argumentos.lote:
+        sys.exit(main_lote(argumentos))
+    if argumentos.sin_interfaz:
+        sys.exit(main_sin_interfaz(argumentos))
+    main(argumentos.cache)
@@ -1,200 +1,972 @@
+import abc
+import os
 import numpy as np
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+import arrastre
 import calculos
 
-def simular_y_animar_trayectorias(solucion):
+def _cargar_matplotlib():
+    """Importa matplotlib con el backend Tk sólo cuando se pide una animación."""
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    return plt, FuncAnimation
+
+def aproximacion_minima_segmento(pA0, pA1, pB0, pB1):
     """
-    Simula y anima las trayectorias de ambos proyectiles.
-    Al final muestra comparación entre posición teórica vs real.
+    Aproximación mínima entre A y B suponiendo movimiento lineal dentro de un paso.
+    Acepta posiciones (2,) o (N, 2). Retorna (s, distancia) con s en [0, 1]
+    la fracción del paso en la que ocurre.
     """
-    try:
-        # Extraer parámetros
-        dt = float(solucion['dt'])
-        T = float(solucion['T'])
-        tc_teorico = float(solucion['tc'])
-        g = float(solucion['g'])
-        sigma = float(solucion.get('sigma', 0.0))
-        factor_velocidad = float(solucion.get('factor_velocidad', 2.0))
-        
-        D = solucion['D']
-        h = solucion['h']
-        v = solucion['v']
-        phi = solucion['phi']
-        u = solucion['u']
-        theta = solucion['theta']
-
-        # Calcular posición TEÓRICA de colisión (sin ruido)
-        x_col_teo, y_col_teo = calculos.posicion_proyectil_A(tc_teorico, D, h, v, phi, g)
-
-        # Configuración de tiempo
-        t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
-        t_final = min(tc_teorico + 1.5, t_max) 
-        t_array = np.arange(0, t_final, dt)
-        
-        # Arrays para guardar trayectoria REAL (con ruido)
-        xA_real, yA_real = [], []
-        xB_real, yB_real = [], []
-        
-        # Condiciones iniciales
-        posA = np.array([float(D), float(h)])
-        velA = np.array([-v * np.cos(phi), v * np.sin(phi)]) 
-        
-        posB = np.array([0.0, 0.0])
-        velB = np.array([0.0, 0.0])
-        
-        b_lanzado = False
-        colision_detectada = False
-        pos_colision_real = None
-        tiempo_colision_real = None
-
-        # SIMULACIÓN CON RUIDO
-        for i, t in enumerate(t_array):
-            # Ruido del viento
-            ruido_A = np.random.normal(0, sigma, 2) * dt
-            ruido_B = np.random.normal(0, sigma, 2) * dt if b_lanzado else np.zeros(2)
-            
+    r0 = np.asarray(pA0) - np.asarray(pB0)
+    dr = (np.asarray(pA1) - np.asarray(pB1)) - r0
+    dr2 = np.sum(dr * dr, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(dr2 > 0, -np.sum(r0 * dr, axis=-1) / dr2, 0.0)
+    s = np.clip(s, 0.0, 1.0)
+    r = r0 + s[..., None] * dr
+    return s, np.sqrt(np.sum(r * r, axis=-1))
+
+# --- MODELOS DE RUIDO DEL VIENTO ---
+
+class ModeloRuido(abc.ABC):
+    """
+    Interfaz de los modelos de viento. generar() produce de una sola vez las
+    aceleraciones de ruido (m/s²) de n_pasos pasos para n realizaciones, con forma
+    (n_pasos, n, 2). `estado` permite continuar una secuencia generada por tramos.
+    """
+    @abc.abstractmethod
+    def generar(self, n, n_pasos, dt, rng, estado=None):
+        """
+        Retorna (ruido, estado): el arreglo (n_pasos, n, 2) y el estado que se pasa
+        en la siguiente llamada para continuar la secuencia (None si no hace falta).
+        Con estado=None empieza una secuencia nueva.
+        """
+
+class RuidoBlanco(ModeloRuido):
+    """Ráfagas independientes en cada paso, de desviación sigma (el modelo original)."""
+    def __init__(self, sigma):
+        self.sigma = float(sigma)
+
+    def generar(self, n, n_pasos, dt, rng, estado=None):
+        return self.sigma * rng.standard_normal((n_pasos, n, 2)), None
+
+class RuidoOrnsteinUhlenbeck(ModeloRuido):
+    """
+    Ráfagas correlacionadas en el tiempo: proceso de Ornstein-Uhlenbeck con
+    desviación estacionaria sigma y tiempo de correlación tau (s).
+    Se muestrea exactamente, así que la correlación no depende de dt.
+    """
+    def __init__(self, sigma, tau=1.0):
+        if tau <= 0:
+            raise ValueError("El tiempo de correlación tau debe ser positivo.")
+        self.sigma = float(sigma)
+        self.tau = float(tau)
+
+    def generar(self, n, n_pasos, dt, rng, estado=None):
+        rho = np.exp(-dt / self.tau)
+        z = rng.standard_normal((n_pasos, n, 2))
+        # Innovaciones escaladas para que la varianza estacionaria sea sigma^2
+        z *= self.sigma * np.sqrt(1 - rho**2)
+        ruido = np.empty_like(z)
+        anterior = self.sigma * rng.standard_normal((n, 2)) if estado is None else estado
+        for k in range(n_pasos):
+            anterior = rho * anterior + z[k]
+            ruido[k] = anterior
+        return ruido, anterior
+
+class VientoConstante(ModeloRuido):
+    """Viento medio constante: una aceleración fija (ax, ay) en m/s²."""
+    def __init__(self, ax=0.0, ay=0.0):
+        self.aceleracion = np.array([float(ax), float(ay)])
+
+    def generar(self, n, n_pasos, dt, rng, estado=None):
+        return np.broadcast_to(self.aceleracion, (n_pasos, n, 2)), None
+
+class SumaRuidos(ModeloRuido):
+    """Superpone varios modelos, p. ej. viento constante más ráfagas."""
+    def __init__(self, *modelos):
+        self.modelos = modelos
+
+    def generar(self, n, n_pasos, dt, rng, estado=None):
+        estados = estado or [None] * len(self.modelos)
+        total = np.zeros((n_pasos, n, 2))
+        nuevos = []
+        for modelo, est in zip(self.modelos, estados):
+            ruido, est = modelo.generar(n, n_pasos, dt, rng, est)
+            total += ruido
+            nuevos.append(est)
+        return total, nuevos
+
+MODELOS_RUIDO = ("blanco", "ou", "constante")
+
+def crear_modelo_ruido(nombre, sigma, tau=1.0, viento=(0.0, 0.0)):
+    """
+    Construye un modelo por nombre: 'blanco', 'ou' o 'constante'.
+    Con 'constante' el viento medio se suma a ráfagas blancas de desviación sigma.
+    """
+    if nombre == "blanco":
+        return RuidoBlanco(sigma)
+    if nombre == "ou":
+        return RuidoOrnsteinUhlenbeck(sigma, tau)
+    if nombre == "constante":
+        return SumaRuidos(VientoConstante(*viento), RuidoBlanco(sigma))
+    raise ValueError(f"Modelo de ruido desconocido: {nombre}")
+
+def separar_ruido_blanco(modelo):
+    """
+    Separa un modelo en la desviación total de sus componentes blancas y el resto (o None).
+    El integrador exacto muestrea la parte blanca con paso_exacto, así que no depende de dt,
+    y trata el resto como una aceleración constante en cada paso.
+    """
+    if isinstance(modelo, RuidoBlanco):
+        return modelo.sigma, None
+    if not isinstance(modelo, SumaRuidos):
+        return 0.0, modelo
+    sigmas, otros = [], []
+    for componente in modelo.modelos:
+        sigma, resto = separar_ruido_blanco(componente)
+        sigmas.append(sigma)
+        if resto is not None:
+            otros.append(resto)
+    resto = None if not otros else otros[0] if len(otros) == 1 else SumaRuidos(*otros)
+    return float(np.sqrt(np.sum(np.square(sigmas)))), resto
+
+def modelo_ruido_de(solucion):
+    """Modelo de solucion['modelo_ruido'], o ruido blanco de solucion['sigma'] si no hay."""
+    modelo = solucion.get('modelo_ruido')
+    return modelo if modelo is not None else RuidoBlanco(solucion.get('sigma', 0.0))
+
+def flujo_ruido(modelo, n, n_pasos, dt, rng, max_elementos=2_000_000):
+    """
+    Entrega el ruido paso a paso, generándolo por tramos de a lo sumo
+    max_elementos valores para que la memoria no crezca con n * n_pasos.
+    """
+    tramo = max(1, max_elementos // (2 * max(n, 1)))
+    estado = None
+    for inicio in range(0, n_pasos, tramo):
+        ruido, estado = modelo.generar(n, min(tramo, n_pasos - inicio), dt, rng, estado)
+        yield from ruido
+
+def paso_aceleracion_constante(pos, vel, h, g, aceleracion):
+    """Avanza (pos, vel) un tiempo h con gravedad más una aceleración constante en el paso."""
+    acel = np.array(aceleracion, dtype=float)
+    acel[..., 1] -= g
+    return pos + vel * h + 0.5 * acel * h**2, vel + acel * h
+
+def paso_exacto(pos, vel, h, g, sigma, rng, aceleracion=None):
+    """
+    Avanza (pos, vel) un tiempo h muestreando exactamente dv = -g dt + sigma dW.
+    El incremento de posición y velocidad es gaussiano conjunto, así que el
+    resultado no depende del tamaño del paso. Acepta estados (2,) o (N, 2).
+    `aceleracion` suma una aceleración constante en el paso (viento medio, arrastre).
+    """
+    pos = np.array(pos, dtype=float)
+    vel = np.array(vel, dtype=float)
+    if sigma > 0:
+        z1 = rng.standard_normal(pos.shape)
+        z2 = rng.standard_normal(pos.shape)
+        # Var(dv) = s^2 h, Var(dx) = s^2 h^3 / 3, Cov(dx, dv) = s^2 h^2 / 2
+        ruido_v = sigma * np.sqrt(h) * z1
+        ruido_x = sigma * h**1.5 * (0.5 * z1 + z2 / (2 * np.sqrt(3)))
+        pos = pos + vel * h + ruido_x
+        vel = vel + ruido_v
+    else:
+        pos = pos + vel * h
+    pos[..., 1] -= 0.5 * g * h**2
+    vel[..., 1] -= g * h
+    if aceleracion is not None:
+        pos = pos + 0.5 * aceleracion * h**2
+        vel = vel + aceleracion * h
+    return pos, vel
+
+def coeficientes_arrastre(solucion):
+    """(k_A, k_B) del arrastre cuadrático de la solución; (0, 0) en el vacío."""
+    k_A = float(solucion.get('k_A', 0.0) or 0.0)
+    k_B = solucion.get('k_B')
+    return k_A, k_A if k_B is None else float(k_B)
+
+def _sumar_arrastre(k):
+    """
+    Función (viento, vel) -> viento + arrastre, elegida una sola vez antes de integrar;
+    sin arrastre (k = 0) devuelve el viento tal cual y no agrega trabajo en cada paso.
+    """
+    if not k:
+        return lambda ruido, vel: ruido
+    return lambda ruido, vel: ruido + arrastre.aceleracion_arrastre(vel, k, 0.0)
+
+def _colision_teorica(solucion):
+    """Punto de colisión sin ruido: el de la solución con arrastre, o el del vacío."""
+    if any(coeficientes_arrastre(solucion)):
+        return float(solucion['x_col']), float(solucion['y_col'])
+    return calculos.posicion_proyectil_A(float(solucion['tc']), solucion['D'], solucion['h'],
+                                         solucion['v'], solucion['phi'], float(solucion['g']))
+
+def limitar_correccion(vel, requerida, correccion_maxima):
+    """
+    Lleva vel hacia la velocidad requerida con un cambio de norma a lo sumo
+    correccion_maxima, sin superar LIMITE_VELOCIDAD_U. Acepta (2,) o (N, 2);
+    las filas con requerida NaN no se corrigen. Retorna (velocidad, |Δv|).
+    """
+    dv = np.nan_to_num(requerida - vel)
+    norma = np.sqrt(np.sum(dv * dv, axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(norma > correccion_maxima, correccion_maxima / norma, 1.0)
+    nueva = vel + dv * factor[..., None]
+    rapidez = np.sqrt(np.sum(nueva * nueva, axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nueva = nueva * np.where(rapidez > calculos.LIMITE_VELOCIDAD_U,
+                                 calculos.LIMITE_VELOCIDAD_U / rapidez, 1.0)[..., None]
+    return nueva, np.sqrt(np.sum((nueva - vel)**2, axis=-1))
+
+def pasos_entre_correcciones(solucion):
+    """Pasos entre correcciones del guiado, o 0 si B vuela en lazo abierto."""
+    frecuencia = float(solucion.get('frecuencia_guiado', 0.0) or 0.0)
+    if frecuencia <= 0:
+        return 0
+    return max(1, int(round(1.0 / (frecuencia * float(solucion['dt'])))))
+
+def simular_trayectorias(solucion, semilla=None):
+    """
+    Simula las trayectorias con ruido de ambos proyectiles sin dibujar nada.
+    La colisión se decide con la aproximación mínima interpolada entre pasos,
+    comparada con solucion['radio_colision'] (3 m por defecto).
+    solucion['integrador'] elige 'euler' (por defecto) o 'exacto' (ver paso_exacto).
+    solucion['modelo_ruido'] elige el viento (ver ModeloRuido); por defecto, ruido blanco de sigma.
+    solucion['precision'] = 'float32' guarda las trayectorias en precisión simple (mitad de memoria);
+    la integración se hace siempre en float64, pero la aproximación mínima se calcula sobre
+    las trayectorias guardadas (error de redondeo del orden de 1e-5 m en float32).
+    solucion['k_A'] y solucion['k_B'] agregan arrastre cuadrático (ver arrastre.py); con el integrador
+    'exacto' la parte blanca del viento se muestrea siempre con paso_exacto y el arrastre
+    y el resto del viento se tratan como constantes en cada paso.
+    solucion['frecuencia_guiado'] (Hz) activa el guiado en lazo cerrado: B se re-apunta con
+    calculos.recalcular_intercepcion partiendo del tc anterior y sin pasar del final de la
+    simulación, con correcciones de a lo sumo
+    solucion['correccion_maxima'] m/s (5 por defecto). Sin ella, B vuela en lazo abierto.
+    Retorna un diccionario con los arreglos de posición y el resultado de la colisión.
+    """
+    # Extraer parámetros
+    dt = float(solucion['dt'])
+    T = float(solucion['T'])
+    tc_teorico = float(solucion['tc'])
+    g = float(solucion['g'])
+    sigma = float(solucion.get('sigma', 0.0))
+    radio_colision = float(solucion.get('radio_colision', 3.0))
+    exacto = solucion.get('integrador', 'euler') == 'exacto'
+    precision = np.dtype(solucion.get('precision', 'float64'))
+    
+    D = solucion['D']
+    h = solucion['h']
+    v = solucion['v']
+    phi = solucion['phi']
+    u = solucion['u']
+    theta = solucion['theta']
+
+    rng = np.random.default_rng(semilla) if semilla is not None else np.random
+
+    # Calcular posición TEÓRICA de colisión (sin ruido)
+    x_col_teo, y_col_teo = _colision_teorica(solucion)
+
+    # Configuración de tiempo
+    t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
+    t_final = min(tc_teorico + 1.5, t_max) 
+    t_array = np.arange(0, t_final, dt)
+    
+    # Trayectoria REAL (con ruido) preasignada: una fila por coordenada (xA, yA, xB, yB)
+    trayectorias = np.zeros((4, len(t_array)), dtype=precision)
+    
+    # Condiciones iniciales
+    posA = np.array([float(D), float(h)])
+    velA = np.array([-v * np.cos(phi), v * np.sin(phi)]) 
+    
+    posB = np.array([0.0, 0.0])
+    velB = np.array([0.0, 0.0])
+    
+    gravedad = np.array([0.0, -g])
+    b_lanzado = False
+    i_lanzamiento = None
+    cada = pasos_entre_correcciones(solucion)
+    correccion_maxima = float(solucion.get('correccion_maxima', 5.0))
+    tc_guiado = tc_teorico
+    correcciones, delta_v_guiado = 0, 0.0
+    distancia_minima = float('inf')
+    pos_colision_real = None
+    tiempo_colision_real = None
+
+    # Ruido del viento: secuencias completas generadas antes de integrar
+    modelo = modelo_ruido_de(solucion)
+    sigma_blanco, resto = separar_ruido_blanco(modelo) if exacto else (0.0, modelo)
+    muestreo_exacto = exacto and resto is None and not any(coeficientes_arrastre(solucion))
+    if not muestreo_exacto:
+        resto = resto if resto is not None else VientoConstante()
+        ruido_A = resto.generar(1, len(t_array), dt, rng)[0][:, 0]
+        ruido_B = resto.generar(1, len(t_array), dt, rng)[0][:, 0]
+    con_arrastre_A, con_arrastre_B = (_sumar_arrastre(k) for k in coeficientes_arrastre(solucion))
+
+    # SIMULACIÓN CON RUIDO
+    for i, t in enumerate(t_array):
+        if muestreo_exacto:
+            # Física Proyectil A (discretización exacta)
+            posA, velA = paso_exacto(posA, velA, dt, g, sigma_blanco, rng)
+        elif exacto:
+            posA, velA = paso_exacto(posA, velA, dt, g, sigma_blanco, rng,
+                                     con_arrastre_A(ruido_A[i], velA))
+        else:
             # Física Proyectil A
-            velA += np.array([0, -g]) * dt + ruido_A
-            posA += velA * dt
-            xA_real.append(posA[0])
-            yA_real.append(posA[1])
-            
-            # Física Proyectil B
-            if t >= T:
-                if not b_lanzado:
-                    velB = np.array([u * np.cos(theta), u * np.sin(theta)])
-                    b_lanzado = True
-                
-                velB += np.array([0, -g]) * dt + ruido_B
-                posB += velB * dt
-                xB_real.append(posB[0])
-                yB_real.append(posB[1])
-                
-                # Detectar colisión (Distancia < 3m)
-                dist = np.sqrt((posA[0]-posB[0])**2 + (posA[1]-posB[1])**2)
-                if dist < 3.0 and not colision_detectada:
-                    colision_detectada = True
-                    pos_colision_real = ((posA[0] + posB[0])/2, (posA[1] + posB[1])/2)
-                    tiempo_colision_real = t
+            velA = velA + (gravedad + con_arrastre_A(ruido_A[i], velA)) * dt
+            posA = posA + velA * dt
+        b_en_vuelo = t + dt > T if exacto else t >= T
+        trayectorias[0:2, i] = posA
+        
+        # Física Proyectil B
+        if b_en_vuelo:
+            # En modo exacto B sale exactamente en T, aunque T caiga dentro del paso
+            h_B = dt if b_lanzado or not exacto else t + dt - T
+            if not b_lanzado:
+                velB = np.array([u * np.cos(theta), u * np.sin(theta)])
+                b_lanzado = True
+                i_lanzamiento = i
+            if muestreo_exacto:
+                posB, velB = paso_exacto(posB, velB, h_B, g, sigma_blanco, rng)
+            elif exacto:
+                posB, velB = paso_exacto(posB, velB, h_B, g, sigma_blanco, rng,
+                                         con_arrastre_B(ruido_B[i], velB))
             else:
-                xB_real.append(0)
-                yB_real.append(0)
+                velB = velB + (gravedad + con_arrastre_B(ruido_B[i], velB)) * dt
+                posB = posB + velB * dt
+            trayectorias[2:4, i] = posB
 
-        # Convertir a numpy
-        xA_real = np.array(xA_real)
-        yA_real = np.array(yA_real)
-        xB_real = np.array(xB_real)
-        yB_real = np.array(yB_real)
+            # Guiado: re-apuntar B desde los estados actuales, partiendo del tc anterior
+            if cada and (i - i_lanzamiento) % cada == 0:
+                nuevo = calculos.recalcular_intercepcion(posA, velA, posB, velB, t + dt, tc_guiado, t_final)
+                if nuevo is not None:
+                    tc_guiado = nuevo[0]
+                    velB, dv = limitar_correccion(velB, np.array(nuevo[1:]), correccion_maxima)
+                    correcciones += 1
+                    delta_v_guiado += float(dv)
 
-        # CONFIGURACIÓN GRÁFICA
-        fig, ax = plt.subplots(figsize=(12, 8))
-        ax.set_title(f"Simulación con Viento (σ={sigma})", fontsize=14)
+    # Aproximación mínima dentro de cada paso con B en vuelo (interpolación lineal),
+    # calculada de una vez sobre las trayectorias guardadas
+    if b_lanzado:
+        estado_inicial = np.array([[D], [h], [0.0], [0.0]])
+        puntos = np.concatenate([estado_inicial, trayectorias], axis=1).astype(float)
+        antes = puntos[:, i_lanzamiento:-1].T
+        despues = puntos[:, i_lanzamiento + 1:].T
+        s, dist = aproximacion_minima_segmento(antes[:, :2], despues[:, :2], antes[:, 2:], despues[:, 2:])
+        k = int(np.argmin(dist))
+        distancia_minima = float(dist[k])
+        s = s[k]
+        p = antes[k] + s * (despues[k] - antes[k])
+        # El paso va de t a t + dt; con pasos grandes se corrige la curvatura de la gravedad
+        curvatura = 0.5 * g * dt**2 * s * (1 - s) if exacto else 0.0
+        pos_colision_real = ((p[0] + p[2])/2, (p[1] + p[3])/2 + curvatura)
+        tiempo_colision_real = float(t_array[i_lanzamiento + k] + s * dt)
+
+    colision_detectada = distancia_minima < radio_colision
+    
+    return {
+        't_array': t_array,
+        'xA_real': trayectorias[0],
+        'yA_real': trayectorias[1],
+        'xB_real': trayectorias[2],
+        'yB_real': trayectorias[3],
+        'b_lanzado': b_lanzado,
+        'colision_detectada': colision_detectada,
+        'pos_colision_real': pos_colision_real if colision_detectada else None,
+        'tiempo_colision_real': tiempo_colision_real if colision_detectada else None,
+        'distancia_minima': distancia_minima,
+        'punto_aproximacion_minima': pos_colision_real,
+        'tiempo_aproximacion_minima': tiempo_colision_real,
+        'radio_colision': radio_colision,
+        'colision_teorica': (x_col_teo, y_col_teo, tc_teorico),
+        'sigma': sigma,
+        'correcciones_guiado': correcciones,
+        'delta_v_guiado': delta_v_guiado,
+        'tc_guiado': tc_guiado if cada else None,
+    }
+
+CAMPOS_TRAYECTORIA = ('t_array', 'xA_real', 'yA_real', 'xB_real', 'yB_real')
+CAMPOS_RESUMEN = ('colision_detectada', 'distancia_minima', 'tiempo_aproximacion_minima',
+                  'radio_colision', 'sigma')
+
+def exportar_trayectorias_npz(ruta, resultados, comprimir=True):
+    """
+    Guarda una o varias simulaciones (resultados de simular_trayectorias) en un .npz.
+    `resultados` puede ser un generador: cada corrida se escribe en cuanto llega y
+    después se descarta, así que la memoria no depende del número de corridas.
+    Retorna el número de corridas escritas.
+    """
+    import zipfile
+    
+    if isinstance(resultados, dict):
+        resultados = [resultados]
+    compresion = zipfile.ZIP_DEFLATED if comprimir else zipfile.ZIP_STORED
+    n = 0
+    with zipfile.ZipFile(ruta, 'w', compression=compresion, allowZip64=True) as archivo:
+        for resultado in resultados:
+            for campo in CAMPOS_TRAYECTORIA + CAMPOS_RESUMEN:
+                valor = resultado[campo]
+                valor = np.asarray(np.nan if valor is None else valor)
+                with archivo.open(f"corrida{n:06d}_{campo}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, valor, allow_pickle=False)
+            n += 1
+    return n
+
+def leer_trayectorias_npz(ruta):
+    """Lee un archivo de exportar_trayectorias_npz corrida a corrida (generador de diccionarios)."""
+    with np.load(ruta) as datos:
+        n = sum(1 for nombre in datos.files if nombre.endswith('_t_array'))
+        for k in range(n):
+            resultado = {campo: datos[f"corrida{k:06d}_{campo}"] for campo in CAMPOS_TRAYECTORIA}
+            for campo in CAMPOS_RESUMEN:
+                valor = datos[f"corrida{k:06d}_{campo}"].item()
+                resultado[campo] = None if isinstance(valor, float) and np.isnan(valor) else valor
+            yield resultado
+
+def imprimir_resumen_simulacion(resultado):
+    """Imprime la comparación entre la colisión teórica y la simulada."""
+    x_col_teo, y_col_teo, tc_teorico = resultado['colision_teorica']
+    sigma = resultado['sigma']
+    pos_colision_real = resultado['pos_colision_real']
+    tiempo_colision_real = resultado['tiempo_colision_real']
+    
+    if resultado['colision_detectada']:
+        print("\n" + "="*60)
+        print("RESULTADOS DE LA SIMULACIÓN")
+        print("="*60)
+        print(f"Colisión Teórica (sin ruido):")
+        print(f"  Posición: ({x_col_teo:.3f}, {y_col_teo:.3f}) m")
+        print(f"  Tiempo: {tc_teorico:.3f} s")
+        print(f"\nColisión Real (con ruido σ={sigma}):")
+        print(f"  Posición: ({pos_colision_real[0]:.3f}, {pos_colision_real[1]:.3f}) m")
+        print(f"  Tiempo: {tiempo_colision_real:.3f} s")
+        print(f"\nError de Posición:")
+        print(f"  Error en X: {abs(pos_colision_real[0] - x_col_teo):.3f} m")
+        print(f"  Error en Y: {abs(pos_colision_real[1] - y_col_teo):.3f} m")
+        print(f"  Error en Tiempo: {abs(tiempo_colision_real - tc_teorico):.3f} s")
+        if resultado.get('correcciones_guiado'):
+            print(f"\nGuiado: {resultado['correcciones_guiado']} correcciones, "
+                  f"Δv total {resultado['delta_v_guiado']:.3f} m/s")
+        print("="*60 + "\n")
+    else:
+        print("\n" + "="*60)
+        print("ADVERTENCIA: No se detectó colisión en la simulación")
+        print("="*60)
+        if resultado.get('tiempo_aproximacion_minima') is not None:
+            print(f"Aproximación mínima: {resultado['distancia_minima']:.3f} m "
+                  f"(radio {resultado['radio_colision']:.2f} m) en t={resultado['tiempo_aproximacion_minima']:.3f} s\n")
+        print(f"Colisión Teórica esperada en:")
+        print(f"  Posición: ({x_col_teo:.3f}, {y_col_teo:.3f}) m")
+        print(f"  Tiempo: {tc_teorico:.3f} s")
+        print(f"\nEl ruido (σ={sigma}) pudo haber impedido la colisión.")
+        if resultado.get('correcciones_guiado'):
+            print(f"El guiado aplicó {resultado['correcciones_guiado']} correcciones "
+                  f"(Δv total {resultado['delta_v_guiado']:.3f} m/s); intente aumentar la corrección máxima.")
+        else:
+            print("Intente reducir σ, ajustar los parámetros o activar el guiado.")
+        print("="*60 + "\n")
+
+class VistaTrayectorias:
+    """
+    Artistas del gráfico de trayectorias, creados una sola vez sobre un Axes existente.
+    cargar() prepara una simulación nueva reutilizándolos; inicio() y cuadro(k) sirven
+    como init_func y función de FuncAnimation o para un bucle propio (p. ej. after() de Tk).
+    """
+    def __init__(self, ax):
+        self.ax = ax
         ax.set_xlabel("Distancia X (m)")
         ax.set_ylabel("Altura Y (m)")
         ax.grid(True, alpha=0.3)
+        self.lineA, = ax.plot([], [], 'b-', label='Proyectil A (Objetivo)', alpha=0.6, linewidth=2)
+        self.lineB, = ax.plot([], [], 'r-', label='Proyectil B (Interceptor)', alpha=0.6, linewidth=2)
+        self.puntoA, = ax.plot([], [], 'bo', markersize=10)
+        self.puntoB, = ax.plot([], [], 'ro', markersize=10)
+        # Marcador de colisión TEÓRICA
+        self.marcador_teorico, = ax.plot([], [], 'g*', markersize=15)
+        # Texto de información
+        self.texto_info = ax.text(0.02, 0.95, "", transform=ax.transAxes,
+                                  verticalalignment='top',
+                                  bbox=dict(facecolor='white', alpha=0.8),
+                                  fontsize=10)
+        self.artistas = (self.lineA, self.lineB, self.puntoA, self.puntoB, self.texto_info)
+        self.n_cuadros = 0
+        self.intervalo = 1
+        self._ultimo_texto = None
+
+    def cargar(self, resultado, solucion):
+        """Prepara los datos decimados, límites y textos de una simulación nueva."""
+        factor_velocidad = float(solucion.get('factor_velocidad', 2.0))
+        dt = float(solucion['dt'])
+        t_array = resultado['t_array']
+        xA_real, yA_real = resultado['xA_real'], resultado['yA_real']
+        xB_real, yB_real = resultado['xB_real'], resultado['yB_real']
+        x_col_teo, y_col_teo, _ = resultado['colision_teorica']
+        pos_colision_real = resultado['pos_colision_real']
+        tiempo_colision_real = resultado['tiempo_colision_real']
+        self.b_lanzado = resultado['b_lanzado']
+        self.colision_detectada = resultado['colision_detectada']
+        self.tiempo_colision_real = tiempo_colision_real
         
+        ax = self.ax
+        ax.set_title(f"Simulación con Viento (σ={resultado['sigma']})", fontsize=14)
         # Límites del gráfico
-        max_x = max(D, np.max(xB_real)) * 1.1
-        max_y = max(h, np.max(yB_real), np.max(yA_real)) * 1.2
+        max_x = max(solucion['D'], np.max(xB_real)) * 1.1
+        max_y = max(solucion['h'], np.max(yB_real), np.max(yA_real)) * 1.2
         ax.set_xlim(-5, max_x)
         ax.set_ylim(0, max_y)
+        self.marcador_teorico.set_data([x_col_teo], [y_col_teo])
+        self.marcador_teorico.set_label(f'Colisión Teórica ({x_col_teo:.1f}, {y_col_teo:.1f})m')
+        ax.legend(loc='upper right', fontsize=9)
+
+        # Decimación: un cuadro por cada 1/fps segundos de reproducción, no por cada paso
+        fps_objetivo = float(solucion.get('fps_objetivo', 30.0))
+        paso_cuadros = max(1, int(round(factor_velocidad / (fps_objetivo * dt))))
+        indices = np.arange(0, len(t_array), paso_cuadros)
+        if indices[-1] != len(t_array) - 1:
+            indices = np.append(indices, len(t_array) - 1)
+        self.n_cuadros = len(indices)
+        self.intervalo = max(1, int(1000 * paso_cuadros * dt / factor_velocidad))
         
-        # Elementos gráficos
-        lineA, = ax.plot([], [], 'b-', label='Proyectil A (Objetivo)', alpha=0.6, linewidth=2)
-        lineB, = ax.plot([], [], 'r-', label='Proyectil B (Interceptor)', alpha=0.6, linewidth=2)
-        puntoA, = ax.plot([], [], 'bo', markersize=10)
-        puntoB, = ax.plot([], [], 'ro', markersize=10)
+        # Buffers preasignados con sólo los puntos que se dibujan
+        self.xA, self.yA = np.ascontiguousarray(xA_real[indices]), np.ascontiguousarray(yA_real[indices])
+        self.xB, self.yB = np.ascontiguousarray(xB_real[indices]), np.ascontiguousarray(yB_real[indices])
+        self.t = t_array[indices]
         
-        # Marcador de colisión TEÓRICA
-        ax.plot(x_col_teo, y_col_teo, 'g*', markersize=15, 
-                label=f'Colisión Teórica ({x_col_teo:.1f}, {y_col_teo:.1f})m')
+        # Partes fijas del texto, formateadas una sola vez
+        self.texto_teorico = f"Posición Teórica: ({x_col_teo:.1f}, {y_col_teo:.1f}) m\n"
+        self.texto_colision = ""
+        if self.colision_detectada:
+            self.texto_colision = (f"\n¡COLISIÓN DETECTADA!\n"
+                                   f"Posición Real: ({pos_colision_real[0]:.1f}, {pos_colision_real[1]:.1f}) m\n"
+                                   f"Tiempo Real: {tiempo_colision_real:.2f} s\n"
+                                   f"Error X: {abs(pos_colision_real[0] - x_col_teo):.2f} m\n"
+                                   f"Error Y: {abs(pos_colision_real[1] - y_col_teo):.2f} m")
+        return self.inicio()
+
+    def inicio(self):
+        for linea in self.artistas[:4]:
+            linea.set_data([], [])
+        self.texto_info.set_text("")
+        self._ultimo_texto = ""
+        return self.artistas
+
+    def cuadro(self, k):
+        self.lineA.set_data(self.xA[:k + 1], self.yA[:k + 1])
+        self.puntoA.set_data(self.xA[k:k + 1], self.yA[k:k + 1])
         
-        # Texto de información
-        texto_info = ax.text(0.02, 0.95, "", transform=ax.transAxes, 
-                           verticalalignment='top',
-                           bbox=dict(facecolor='white', alpha=0.8),
-                           fontsize=10)
-
-        def init():
-            lineA.set_data([], [])
-            lineB.set_data([], [])
-            puntoA.set_data([], [])
-            puntoB.set_data([], [])
-            texto_info.set_text("")
-            return lineA, lineB, puntoA, puntoB, texto_info
-
-        def animate(i):
-            lineA.set_data(xA_real[:i], yA_real[:i])
-            puntoA.set_data([xA_real[i]], [yA_real[i]])
-            
-            lineB.set_data(xB_real[:i], yB_real[:i])
-            puntoB.set_data([xB_real[i]], [yB_real[i]])
-            
-            t_actual = t_array[i]
-            
-            # Información dinámica
-            info_text = f"Tiempo: {t_actual:.2f} s\n"
-            info_text += f"Posición Teórica: ({x_col_teo:.1f}, {y_col_teo:.1f}) m\n"
-            
-            if b_lanzado and i < len(xB_real):
-                dist = np.sqrt((xA_real[i]-xB_real[i])**2 + (yA_real[i]-yB_real[i])**2)
-                
-                if colision_detectada and t_actual >= tiempo_colision_real:
-                    info_text += f"\n¡COLISIÓN DETECTADA!\n"
-                    info_text += f"Posición Real: ({pos_colision_real[0]:.1f}, {pos_colision_real[1]:.1f}) m\n"
-                    info_text += f"Tiempo Real: {tiempo_colision_real:.2f} s\n"
-                    error_x = abs(pos_colision_real[0] - x_col_teo)
-                    error_y = abs(pos_colision_real[1] - y_col_teo)
-                    info_text += f"Error X: {error_x:.2f} m\n"
-                    info_text += f"Error Y: {error_y:.2f} m"
-                else:
-                    info_text += f"Distancia actual: {dist:.2f} m"
-            
-            texto_info.set_text(info_text)
-            
-            return lineA, lineB, puntoA, puntoB, texto_info
+        self.lineB.set_data(self.xB[:k + 1], self.yB[:k + 1])
+        self.puntoB.set_data(self.xB[k:k + 1], self.yB[k:k + 1])
+        
+        t_actual = self.t[k]
+        
+        # Información dinámica
+        info_text = f"Tiempo: {t_actual:.2f} s\n" + self.texto_teorico
+        if self.b_lanzado:
+            if self.colision_detectada and t_actual >= self.tiempo_colision_real:
+                info_text += self.texto_colision
+            else:
+                dist = np.hypot(self.xA[k] - self.xB[k], self.yA[k] - self.yB[k])
+                info_text += f"Distancia actual: {dist:.2f} m"
+        
+        if info_text != self._ultimo_texto:
+            self.texto_info.set_text(info_text)
+            self._ultimo_texto = info_text
+        return self.artistas
+
+def simular_y_animar_trayectorias(solucion):
+    """
+    Simula y anima las trayectorias de ambos proyectiles en una ventana de pyplot.
+    Al final muestra comparación entre posición teórica vs real.
+    La interfaz gráfica usa VistaTrayectorias sobre su propio lienzo en lugar de esto.
+    """
+    try:
+        resultado = simular_trayectorias(solucion)
+        plt, FuncAnimation = _cargar_matplotlib()
+
+        # CONFIGURACIÓN GRÁFICA
+        fig, ax = plt.subplots(figsize=(12, 8))
+        vista = VistaTrayectorias(ax)
+        vista.cargar(resultado, solucion)
 
         # Crear animación
-        intervalo = int(1000 * dt / factor_velocidad)
-        anim = FuncAnimation(fig, animate, init_func=init, frames=len(t_array), 
-                           interval=intervalo, blit=True, repeat=False)
-        
-        ax.legend(loc='upper right', fontsize=9)
+        anim = FuncAnimation(fig, vista.cuadro, init_func=vista.inicio, frames=vista.n_cuadros,
+                             interval=vista.intervalo, blit=True, repeat=False)
         plt.tight_layout()
         
         # MOSTRAR COMPARACIÓN FINAL
-        if colision_detectada:
-            print("\n" + "="*60)
-            print("RESULTADOS DE LA SIMULACIÓN")
-            print("="*60)
-            print(f"Colisión Teórica (sin ruido):")
-            print(f"  Posición: ({x_col_teo:.3f}, {y_col_teo:.3f}) m")
-            print(f"  Tiempo: {tc_teorico:.3f} s")
-            print(f"\nColisión Real (con ruido σ={sigma}):")
-            print(f"  Posición: ({pos_colision_real[0]:.3f}, {pos_colision_real[1]:.3f}) m")
-            print(f"  Tiempo: {tiempo_colision_real:.3f} s")
-            print(f"\nError de Posición:")
-            print(f"  Error en X: {abs(pos_colision_real[0] - x_col_teo):.3f} m")
-            print(f"  Error en Y: {abs(pos_colision_real[1] - y_col_teo):.3f} m")
-            print(f"  Error en Tiempo: {abs(tiempo_colision_real - tc_teorico):.3f} s")
-            print("="*60 + "\n")
-        else:
-            print("\n" + "="*60)
-            print("ADVERTENCIA: No se detectó colisión en la simulación")
-            print("="*60)
-            print(f"Colisión Teórica esperada en:")
-            print(f"  Posición: ({x_col_teo:.3f}, {y_col_teo:.3f}) m")
-            print(f"  Tiempo: {tc_teorico:.3f} s")
-            print(f"\nEl ruido (σ={sigma}) pudo haber impedido la colisión.")
-            print("Intente reducir σ o ajustar los parámetros.")
-            print("="*60 + "\n")
+        imprimir_resumen_simulacion(resultado)
         
         plt.show()
+        plt.close(fig)
 
     except Exception as e:
         print(f"Error en simulación: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+def simular_monte_carlo(solucion, n_realizaciones=1000, semilla=None):
+    """
+    Simula N realizaciones con ruido a la vez, avanzando estados (N, 2) en cada paso.
+    `semilla` puede ser un entero, una np.random.SeedSequence o un Generator.
+    Usa la misma física, integrador, modelo de ruido, guiado y criterio de colisión que simular_trayectorias.
+    Retorna un diccionario con la tasa de impacto y las distribuciones por realización.
+    """
+    dt = float(solucion['dt'])
+    T = float(solucion['T'])
+    tc_teorico = float(solucion['tc'])
+    g = float(solucion['g'])
+    radio_colision = float(solucion.get('radio_colision', 3.0))
+    exacto = solucion.get('integrador', 'euler') == 'exacto'
+
+    D = float(solucion['D'])
+    h = float(solucion['h'])
+    v = float(solucion['v'])
+    phi = float(solucion['phi'])
+    u = float(solucion['u'])
+    theta = float(solucion['theta'])
+
+    rng = np.random.default_rng(semilla)
+    n = int(n_realizaciones)
+
+    x_col_teo, y_col_teo = _colision_teorica(solucion)
+    t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
+    t_final = min(tc_teorico + 1.5, t_max)
+    t_array = np.arange(0, t_final, dt)
+
+    # Estados (N, 2) de todas las realizaciones
+    posA = np.tile([D, h], (n, 1)).astype(float)
+    velA = np.tile([-v * np.cos(phi), v * np.sin(phi)], (n, 1)).astype(float)
+    posB = np.zeros((n, 2))
+    velB = np.zeros((n, 2))
+    gravedad = np.array([0.0, -g]) * dt
+
+    b_lanzado = False
+    distancia_minima = np.full(n, np.inf)
+    tiempo_distancia_minima = np.full(n, np.nan)
+    punto_distancia_minima = np.full((n, 2), np.nan)
+    cada = pasos_entre_correcciones(solucion)
+    correccion_maxima = float(solucion.get('correccion_maxima', 5.0))
+    tc_guiado = np.full(n, tc_teorico)
+    delta_v_guiado = np.zeros(n)
+
+    # El ruido de cada proyectil se genera por tramos grandes, no paso a paso
+    modelo = modelo_ruido_de(solucion)
+    sigma_blanco, resto = separar_ruido_blanco(modelo) if exacto else (0.0, modelo)
+    muestreo_exacto = exacto and resto is None and not any(coeficientes_arrastre(solucion))
+    if not muestreo_exacto:
+        resto = resto if resto is not None else VientoConstante()
+        flujo_A = flujo_ruido(resto, n, len(t_array), dt, rng)
+        flujo_B = flujo_ruido(resto, n, len(t_array), dt, rng)
+    con_arrastre_A, con_arrastre_B = (_sumar_arrastre(k) for k in coeficientes_arrastre(solucion))
+
+    for i, t in enumerate(t_array):
+        posA_prev, posB_prev = posA.copy(), posB.copy()
+        if not muestreo_exacto:
+            ruido_A, ruido_B = next(flujo_A), next(flujo_B)
+
+        if muestreo_exacto:
+            posA, velA = paso_exacto(posA, velA, dt, g, sigma_blanco, rng)
+        elif exacto:
+            posA, velA = paso_exacto(posA, velA, dt, g, sigma_blanco, rng,
+                                     con_arrastre_A(ruido_A, velA))
+        else:
+            velA += gravedad + con_arrastre_A(ruido_A, velA) * dt
+            posA += velA * dt
+        b_en_vuelo = t + dt > T if exacto else t >= T
+
+        if b_en_vuelo:
+            h_B = dt if b_lanzado or not exacto else t + dt - T
+            if not b_lanzado:
+                velB[:] = [u * np.cos(theta), u * np.sin(theta)]
+                b_lanzado = True
+                i_lanzamiento = i
+
+            if muestreo_exacto:
+                posB, velB = paso_exacto(posB, velB, h_B, g, sigma_blanco, rng)
+            elif exacto:
+                posB, velB = paso_exacto(posB, velB, h_B, g, sigma_blanco, rng,
+                                         con_arrastre_B(ruido_B, velB))
+            else:
+                velB += gravedad + con_arrastre_B(ruido_B, velB) * dt
+                posB += velB * dt
+
+            s, dist = aproximacion_minima_segmento(posA_prev, posA, posB_prev, posB)
+            mas_cerca = dist < distancia_minima
+            if mas_cerca.any():
+                sc = s[mas_cerca, None]
+                pA = posA_prev[mas_cerca] + sc * (posA[mas_cerca] - posA_prev[mas_cerca])
+                pB = posB_prev[mas_cerca] + sc * (posB[mas_cerca] - posB_prev[mas_cerca])
+                punto = (pA + pB) / 2
+                if exacto:
+                    punto[:, 1] += 0.5 * g * dt**2 * s[mas_cerca] * (1 - s[mas_cerca])
+                distancia_minima[mas_cerca] = dist[mas_cerca]
+                tiempo_distancia_minima[mas_cerca] = t + s[mas_cerca] * dt
+                punto_distancia_minima[mas_cerca] = punto
+
+            if cada and (i - i_lanzamiento) % cada == 0:
+                tc_nuevo, requerida = calculos.recalcular_intercepcion_lote(posA, velA, posB, velB,
+                                                                           t + dt, tc_guiado, t_final)
+                tc_guiado = np.where(np.isfinite(tc_nuevo), tc_nuevo, tc_guiado)
+                velB, dv = limitar_correccion(velB, requerida, correccion_maxima)
+                delta_v_guiado += dv
+
+    impacto = distancia_minima < radio_colision
+    tiempos_colision = np.where(impacto, tiempo_distancia_minima, np.nan)
+    pos_colision = np.where(impacto[:, None], punto_distancia_minima, np.nan)
+    errores_posicion = np.hypot(pos_colision[:, 0] - x_col_teo, pos_colision[:, 1] - y_col_teo)
+
+    return {
+        'n_realizaciones': n,
+        'tasa_impacto': float(np.mean(impacto)) if n > 0 else 0.0,
+        'impacto': impacto,
+        'tiempos_colision': tiempos_colision,
+        'errores_tiempo': np.abs(tiempos_colision - tc_teorico),
+        'posiciones_colision': pos_colision,
+        'errores_posicion': errores_posicion,
+        'distancia_minima': distancia_minima,
+        'tiempo_distancia_minima': tiempo_distancia_minima,
+        'delta_v_guiado': delta_v_guiado,
+        'colision_teorica': (x_col_teo, y_col_teo, tc_teorico),
+    }
+
+def combinar_resultados_monte_carlo(resultados):
+    """Une resultados de simular_monte_carlo obtenidos por lotes del mismo escenario."""
+    resultados = list(resultados)
+    if not resultados:
+        raise ValueError("No hay resultados de Monte Carlo para combinar.")
+    combinado = {'colision_teorica': resultados[0]['colision_teorica']}
+    for clave in ('impacto', 'tiempos_colision', 'errores_tiempo', 'posiciones_colision',
+                  'errores_posicion', 'distancia_minima', 'tiempo_distancia_minima', 'delta_v_guiado'):
+        combinado[clave] = np.concatenate([r[clave] for r in resultados])
+    n = len(combinado['impacto'])
+    combinado['n_realizaciones'] = n
+    combinado['tasa_impacto'] = float(np.mean(combinado['impacto'])) if n > 0 else 0.0
+    return combinado
+
+def simular_monte_carlo_paralelo(solucion, n_realizaciones=1000, semilla=None, n_procesos=None):
+    """
+    Reparte las realizaciones entre procesos, cada uno con su propio flujo aleatorio
+    derivado de una sola SeedSequence. Para una misma semilla y número de procesos
+    el resultado es idéntico bit a bit. `semilla` puede ser un entero o una SeedSequence.
+    Retorna lo mismo que simular_monte_carlo.
+    """
+    n_procesos = n_procesos or os.cpu_count() or 1
+    n_procesos = max(1, min(int(n_procesos), int(n_realizaciones)))
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    flujos = semilla.spawn(n_procesos)
+    tamanos = [len(parte) for parte in np.array_split(np.arange(n_realizaciones), n_procesos)]
+    solucion = dict(solucion)
+    
+    if n_procesos == 1:
+        return simular_monte_carlo(solucion, tamanos[0], flujos[0])
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        partes = list(ejecutor.map(simular_monte_carlo, [solucion] * n_procesos, tamanos, flujos))
+    return combinar_resultados_monte_carlo(partes)
+
+def barrido_sigma_monte_carlo(solucion, sigmas, n_realizaciones=1000, semilla=None, n_procesos=None):
+    """
+    Tasa de impacto para cada σ de ruido blanco, con un flujo aleatorio independiente por valor.
+    Ignora solucion['modelo_ruido'].
+    """
+    flujos = np.random.SeedSequence(semilla).spawn(len(sigmas))
+    tasas = []
+    for sigma, flujo in zip(sigmas, flujos):
+        escenario = dict(solucion, sigma=float(sigma), modelo_ruido=None)
+        resultado = simular_monte_carlo_paralelo(escenario, n_realizaciones, flujo, n_procesos)
+        tasas.append(resultado['tasa_impacto'])
+    return np.array(tasas)
+
+# --- SOLUCIÓN ROBUSTA: MÁXIMA PROBABILIDAD DE IMPACTO ---
+
+def _paso_simulacion(pos, vel, h, g, ruido, muestreo_exacto, exacto, sigma_blanco, rng):
+    """Un paso de un proyectil sin arrastre, con el mismo integrador que simular_monte_carlo."""
+    if muestreo_exacto:
+        return paso_exacto(pos, vel, h, g, sigma_blanco, rng)
+    if exacto:
+        return paso_exacto(pos, vel, h, g, sigma_blanco, rng, ruido)
+    vel = vel + np.array([0.0, -g]) * h + ruido * h
+    return pos + vel * h, vel
+
+def posicion_relativa_base(solucion, n_realizaciones, rng, t_final):
+    """
+    Posición relativa A - B de un lanzamiento de B con velocidad cero, con el mismo integrador,
+    la misma malla de tiempos y el mismo modelo de ruido que simular_monte_carlo.
+    Sin arrastre cada integrador es lineal en la velocidad inicial, así que la posición de B
+    lanzado con velocidad w es la de esta base más w por el tiempo integrado desde el
+    lanzamiento. El primer punto es el paso en que se lanza B, todavía en el origen.
+    Retorna (t, tiempo_vuelo, base) con la base de forma (n_t, n, 2).
+    """
+    D, h, v, phi = (float(solucion[c]) for c in ('D', 'h', 'v', 'phi'))
+    T, dt, g = float(solucion['T']), float(solucion['dt']), float(solucion['g'])
+    exacto = solucion.get('integrador', 'euler') == 'exacto'
+    modelo = modelo_ruido_de(solucion)
+    sigma_blanco, resto = separar_ruido_blanco(modelo) if exacto else (0.0, modelo)
+    muestreo_exacto = exacto and resto is None
+    n = int(n_realizaciones)
+    t_array = np.arange(0, t_final, dt)
+
+    if not muestreo_exacto:
+        flujo_A = flujo_ruido(resto, n, len(t_array), dt, rng)
+        flujo_B = flujo_ruido(resto, n, len(t_array), dt, rng)
+    ruido_A = ruido_B = None
+    posA = np.tile([D, h], (n, 1)).astype(float)
+    velA = np.tile([-v * np.cos(phi), v * np.sin(phi)], (n, 1)).astype(float)
+    posB, velB = np.zeros((n, 2)), np.zeros((n, 2))
+    tiempos, vuelos, bases = [], [], []
+    for t in t_array:
+        if not muestreo_exacto:
+            ruido_A, ruido_B = next(flujo_A), next(flujo_B)
+        if not tiempos and (t + dt > T if exacto else t >= T):
+            tiempos.append(t)
+            vuelos.append(0.0)
+            bases.append(posA.copy())
+        posA, velA = _paso_simulacion(posA, velA, dt, g, ruido_A, muestreo_exacto, exacto, sigma_blanco, rng)
+        if tiempos:
+            h_B = t + dt - T if exacto and len(tiempos) == 1 else dt
+            posB, velB = _paso_simulacion(posB, velB, h_B, g, ruido_B, muestreo_exacto, exacto, sigma_blanco, rng)
+            tiempos.append(t + dt)
+            vuelos.append(vuelos[-1] + h_B)
+            bases.append(posA - posB)
+    if len(tiempos) < 2:
+        raise ValueError("B no llega a lanzarse antes de que A toque el suelo.")
+    return np.array(tiempos), np.array(vuelos), np.array(bases)
+
+def _tc_nominal(solucion, u, theta):
+    """Instante de la aproximación mínima nominal de B lanzado con (u, θ); la posición relativa es r0 + w (t - T)."""
+    D, h, v, phi = (float(solucion[c]) for c in ('D', 'h', 'v', 'phi'))
+    T, g = float(solucion['T']), float(solucion['g'])
+    xA, yA = calculos.posicion_proyectil_A(T, D, h, v, phi, g)
+    wx = -v * np.cos(phi) - u * np.cos(theta)
+    wy = v * np.sin(phi) - g * T - u * np.sin(theta)
+    return T + np.maximum(0.0, -(xA * wx + yA * wy) / (wx**2 + wy**2))
+
+def probabilidad_impacto_lote(solucion, u, theta, t, tiempo_vuelo, base, max_elementos=2_000_000):
+    """
+    Probabilidad de impacto y distancia mínima media de cada lanzamiento (u, θ) sobre las
+    mismas realizaciones de posicion_relativa_base (números aleatorios comunes). Como
+    simular_monte_carlo, cada candidato sólo cuenta los pasos hasta min(tc + 1.5, t_max),
+    con su tc nominal. Evalúa por lotes de candidatos de a lo sumo max_elementos valores.
+    Retorna dos arreglos con la forma de u.
+    """
+    radio_colision = float(solucion.get('radio_colision', 3.0))
+    h, v, phi, g = (float(solucion[c]) for c in ('h', 'v', 'phi', 'g'))
+    dt = float(solucion['dt'])
+    u, theta = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(theta, dtype=float))
+    forma = u.shape
+    velocidad_B = np.stack([u.ravel() * np.cos(theta.ravel()), u.ravel() * np.sin(theta.ravel())], axis=-1)
+
+    # Segmentos de cada candidato: los pasos de np.arange(0, t_final, dt) desde el lanzamiento
+    t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
+    t_final = np.minimum(_tc_nominal(solucion, u.ravel(), theta.ravel()) + 1.5, t_max)
+    n_segmentos = np.ceil(t_final / dt).astype(int) - int(round(t[0] / dt))
+    fuera = np.arange(len(t) - 1)[None, :] >= n_segmentos[:, None]
+
+    probabilidad, distancia_media = np.empty(len(velocidad_B)), np.empty(len(velocidad_B))
+    lote = max(1, max_elementos // base.size)
+    for inicio in range(0, len(velocidad_B), lote):
+        parte = slice(inicio, inicio + lote)
+        r = base - tiempo_vuelo[:, None, None] * velocidad_B[parte, None, None, :]
+        _, dist = aproximacion_minima_segmento(r[:, :-1], r[:, 1:], 0.0, 0.0)
+        dist[fuera[parte]] = np.inf
+        minima = dist.min(axis=1)
+        probabilidad[parte] = np.mean(minima < radio_colision, axis=1)
+        distancia_media[parte] = minima.mean(axis=1)
+    return probabilidad.reshape(forma), distancia_media.reshape(forma)
+
+def _mejor_candidato(probabilidad, distancia_media):
+    """Índice de mayor probabilidad; a igual probabilidad, el de menor distancia media."""
+    return int(np.lexsort((distancia_media, -probabilidad))[0])
+
+def resolver_intercepcion_robusta(solucion, n_realizaciones=500, semilla=None, n_candidatos=41,
+                                  max_rondas=12, tol_theta=1e-4, progreso=None, cancelado=None):
+    """
+    Elige (u, θ) de B que maximizan la probabilidad de pasar a menos de radio_colision
+    de A bajo el modelo de viento de la solución, con u <= LIMITE_VELOCIDAD_U.
+    Primero recorre tc en el intervalo de búsqueda con las (u, θ) nominales; después
+    afina (u, θ) alrededor del mejor con búsqueda por patrones, lo que corrige sesgos
+    como el de un viento medio. Todas las evaluaciones usan las mismas realizaciones,
+    así que comparar candidatos no agrega ruido. El tc retornado es el de la aproximación
+    mínima nominal del lanzamiento elegido. Lanza ValueError si hay arrastre, guiado o si
+    ningún tc del intervalo es factible.
+    progreso(fraccion) recibe el avance y cancelado() se consulta entre cada lote de
+    candidatos; si retorna True la búsqueda se detiene y retorna None.
+    """
+    if any(coeficientes_arrastre(solucion)):
+        raise ValueError("La solución robusta supone movimiento sin arrastre.")
+    if pasos_entre_correcciones(solucion):
+        raise ValueError("La solución robusta supone que B vuela en lazo abierto (sin guiado).")
+    D, h, v, phi = (float(solucion[c]) for c in ('D', 'h', 'v', 'phi'))
+    T, g = float(solucion['T']), float(solucion['g'])
+    limite = calculos.LIMITE_VELOCIDAD_U
+
+    curva = calculos.curva_velocidad_u(D, h, v, phi, T, g, n_candidatos)
+    factible = curva['u'] <= limite
+    if not factible.any():
+        raise ValueError(f"Ninguna intercepción del intervalo tiene u <= {limite} m/s.")
+    u_malla = curva['u'][factible]
+    theta_malla = calculos.funcion_angulo_theta_lote(curva['tc'][factible], D, h, v, phi, T, g)
+
+    rng = np.random.default_rng(semilla)
+    t_max = calculos.encontrar_t_max_proyectil_A(h, v, phi, g)
+    t, tiempo_vuelo, base = posicion_relativa_base(solucion, n_realizaciones, rng, t_max)
+
+    def avanzar(fraccion):
+        if progreso is not None:
+            progreso(fraccion)
+        return cancelado is not None and cancelado()
+
+    def evaluar(u, theta):
+        return probabilidad_impacto_lote(solucion, u, theta, t, tiempo_vuelo, base)
+
+    # 1) Barrido de tc sobre la curva nominal
+    if avanzar(0.3):
+        return None
+    probabilidad, distancia = evaluar(u_malla, theta_malla)
+    evaluaciones = len(u_malla)
+    k = _mejor_candidato(probabilidad, distancia)
+    u_mejor, theta_mejor = u_malla[k], theta_malla[k]
+    p_mejor, d_mejor = probabilidad[k], distancia[k]
+
+    # 2) Búsqueda por patrones en (u, θ); el paso inicial es el de la malla de tc
+    paso_u = max(np.ptp(u_malla) / len(u_malla), 0.5)
+    paso_theta = max(np.ptp(theta_malla) / len(theta_malla), np.radians(0.5))
+    rondas = 0
+    desplazamientos = np.array([(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j], dtype=float)
+    while rondas < max_rondas and paso_theta > tol_theta:
+        if avanzar(0.5 + 0.5 * rondas / max_rondas):
+            return None
+        rondas += 1
+        u_cand = np.clip(u_mejor + paso_u * desplazamientos[:, 0], 0.0, limite)
+        theta_cand = theta_mejor + paso_theta * desplazamientos[:, 1]
+        probabilidad, distancia = evaluar(u_cand, theta_cand)
+        evaluaciones += len(u_cand)
+        k = _mejor_candidato(np.append(probabilidad, p_mejor), np.append(distancia, d_mejor))
+        if k < len(u_cand):
+            u_mejor, theta_mejor = u_cand[k], theta_cand[k]
+            p_mejor, d_mejor = probabilidad[k], distancia[k]
+        else:
+            paso_u, paso_theta = paso_u / 2, paso_theta / 2
+
+    if avanzar(1.0):
+        return None
+    p_nominal = None
+    if 'u' in solucion and 'theta' in solucion:
+        p_nominal = float(evaluar(solucion['u'], solucion['theta'])[0])
+        evaluaciones += 1
+
+    tc = _tc_nominal(solucion, u_mejor, theta_mejor)
+    x_col, y_col = calculos.posicion_proyectil_A(tc, D, h, v, phi, g)
+
+    robusta = {c: valor for c, valor in solucion.items() if c != 'desde_cache'}
+    robusta.update({
+        'u': float(u_mejor), 'theta': float(theta_mejor), 'tc': float(tc),
+        'x_col': float(x_col), 'y_col': float(y_col),
+        'metodo': "Robusto (máxima probabilidad de impacto)", 'iteraciones': rondas,
+        'probabilidad_impacto': float(p_mejor), 'probabilidad_impacto_nominal': p_nominal,
+        'distancia_media': float(d_mejor), 'evaluaciones': evaluaciones,
+        'n_realizaciones': int(n_realizaciones),
+    })
+    return robusta